@@ -1,13 +1,15 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
 import sys
 import os
-import re
+import json
 
 # Add project root to sys.path to allow importing from src
 sys.path.append(os.path.join(os.path.dirname(__file__), '../'))
 
+from src.deap.manifest import manifest_reader
+
 # Import core logic
 # Note: On Vercel, we need to ensure dependencies are installed via requirements.txt
 try:
@@ -32,20 +34,12 @@ DATA_DIR = os.path.join(os.path.dirname(__file__), '../data')
 
 def get_latest_generation():
     """
-    Scans the data directory for generation folders (g0, g1, ...) and returns the highest generation number.
+    Returns the highest generation number from the cached manifest (data/manifest.json).
 
     Returns:
-        int: The highest generation number found, or -1 if no generation folders exist.
-    """
-    max_g = -1
-    if not os.path.exists(DATA_DIR):
-        return max_g
-    for name in os.listdir(DATA_DIR):
-        if re.match(r'^g\d+$', name):
-            g_num = int(name[1:])
-            if g_num > max_g:
-                max_g = g_num
-    return max_g
+        int: The highest generation number found, or -1 if no generation exists.
+    """
+    return manifest_reader(DATA_DIR).latest_generation()
 
 @app.get("/", response_class=HTMLResponse)
 def read_root_index():
@@ -55,8 +49,8 @@ def read_root_index():
     """
     latest_g = get_latest_generation()
     if latest_g >= 0:
-        html_path = os.path.join(DATA_DIR, f"g{latest_g}", "wordcrowd.html")
-        if os.path.exists(html_path):
+        html_path = manifest_reader(DATA_DIR).artifact_path(latest_g, "wordcrowd")
+        if html_path and os.path.exists(html_path):
             with open(html_path, "r", encoding="utf-8") as f:
                 content = f.read()
             return content
@@ -94,6 +88,10 @@ def read_root():
         "endpoints": [
             "/api/status",
             "/api/evolve",
+            "/api/stream",
+            "/api/history/trend",
+            "/api/history/first",
+            "/api/history/ancestors/{individual_id}",
             "/api/docs"
         ]
     }
@@ -110,7 +108,7 @@ def get_status():
     return {
         "latest_generation": g,
         "data_dir_exists": os.path.exists(DATA_DIR),
-        "generations": [d for d in os.listdir(DATA_DIR) if re.match(r'^g\d+$', d)] if os.path.exists(DATA_DIR) else []
+        "generations": [f"g{n}" for n in sorted(manifest_reader(DATA_DIR).load()["generations"], key=int)]
     }
 
 @app.post("/api/evolve")
@@ -137,13 +135,116 @@ def trigger_evolution(force_disaster: bool = False):
         # This endpoint is useful for demonstration or if connected to external storage.
         new_g = engine.evolve(current_g, force_disaster=force_disaster)
         
+        # Artifacts (wordcrowd etc.) keep rendering in the background; poll data/g{n}/artifacts.json
         return {
             "status": "success", 
             "previous_generation": current_g,
             "new_generation": new_g,
+            "artifacts": (engine.repo.load_artifact_status(new_g) or {}).get("status"),
             "note": "On serverless environments, generated data is ephemeral."
         }
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
+@app.post("/api/stream")
+def stream_evolution(generations: int = 10, checkpoint_every: int = 10, force_disaster: bool = False):
+    """
+    Evolves several generations and streams one JSON stats line per generation (NDJSON).
+
+    Args:
+        generations (int, optional): Number of generations to evolve. Defaults to 10.
+        checkpoint_every (int, optional): Save every K generations (the last one is always saved). Defaults to 10.
+        force_disaster (bool, optional): If True, forces a disaster event in the first generation. Defaults to False.
+
+    Returns:
+        StreamingResponse: application/x-ndjson lines with the stats of each generation.
+    """
+    if Evolution is None:
+        return {"status": "error", "message": "Evolution module could not be imported."}
+
+    def lines():
+        engine = Evolution()
+        stream = engine.stream(get_latest_generation(), generations, checkpoint_every=checkpoint_every,
+                               force_disaster=force_disaster)
+        try:
+            # Closing the response (client disconnect) closes the generator, which saves and stops
+            for stats in stream:
+                yield json.dumps(stats) + "\n"
+        except Exception as e:
+            yield json.dumps({"status": "error", "message": str(e)}) + "\n"
+        finally:
+            stream.close()
+            engine.close()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+def open_history():
+    """SQLite history store, or None if data/mindmutant.db does not exist yet."""
+    from src.deap.sqlite_repository import SQLiteRepository, DB_FILENAME
+    db_path = os.path.join(DATA_DIR, DB_FILENAME)
+    if not os.path.exists(db_path):
+        return None
+    return SQLiteRepository(db_path=db_path)
+
+NO_HISTORY = {"status": "error", "message": "No history database. Run with --storage sqlite or `app.py history --import-json`."}
+
+@app.get("/api/history/trend")
+def history_trend(start: int = None, end: int = None):
+    """
+    Novelty trend across generations.
+
+    Args:
+        start (int, optional): First generation. Defaults to the first stored.
+        end (int, optional): Last generation. Defaults to the last stored.
+
+    Returns:
+        dict: Per-generation count and novelty min/mean/max.
+    """
+    repo = open_history()
+    if repo is None:
+        return NO_HISTORY
+    try:
+        return {"status": "success", "trend": repo.novelty_trend(start, end)}
+    finally:
+        repo.close()
+
+@app.get("/api/history/first")
+def history_first(content: str):
+    """
+    First appearance of a content.
+
+    Args:
+        content (str): Content to look up (whitespace is normalized).
+
+    Returns:
+        dict: Generation and individual id of the first appearance, or null.
+    """
+    repo = open_history()
+    if repo is None:
+        return NO_HISTORY
+    try:
+        return {"status": "success", "first": repo.first_appearance(content)}
+    finally:
+        repo.close()
+
+@app.get("/api/history/ancestors/{individual_id}")
+def history_ancestors(individual_id: str, max_depth: int = 50):
+    """
+    Ancestors of an individual.
+
+    Args:
+        individual_id (str): Individual id.
+        max_depth (int, optional): Generations to walk back. Defaults to 50.
+
+    Returns:
+        dict: Ancestors with their depth (1 = parent), content and first generation.
+    """
+    repo = open_history()
+    if repo is None:
+        return NO_HISTORY
+    try:
+        return {"status": "success", "ancestors": repo.ancestors(individual_id, max_depth)}
+    finally:
+        repo.close()
+
 # For Vercel, we just need to expose 'app'
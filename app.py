@@ -1,37 +1,31 @@
 import os
 import sys
 import argparse
-import re
 
 # Ensure modules can be imported
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from src.poll.pollinate import pollinate
-from src.deap.evolution import Evolution
+# Heavy modules (DEAP, NumPy, spaCy) are imported inside the commands that need them,
+# so lightweight commands like `now` start instantly.
 
 DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
 
 def get_latest_generation():
     """
-    Scans data directory for g{n} folders and returns the max n.
+    Returns the latest generation recorded in data/manifest.json (scanning data/ once if there is none yet).
     Returns -1 if no generation exists.
     """
-    max_g = -1
-    if not os.path.exists(DATA_DIR):
-        return max_g
-        
-    for name in os.listdir(DATA_DIR):
-        if re.match(r'^g\d+$', name):
-            g_num = int(name[1:])
-            if g_num > max_g:
-                max_g = g_num
-    return max_g
+    from src.deap.manifest import get_latest_generation as latest_in_manifest
+    return latest_in_manifest(DATA_DIR)
 
 def command_poll(force_disaster=False, engine_type='standard'):
     """
     1. Pollinate (inject words from poll/addwords.csv.done or similar)
     2. Evolve to next generation
     """
+    from src.poll.pollinate import pollinate
+    from src.deap.evolution import Evolution
+
     print("--- Step 1: Pollination ---")
     pollinate()
     
@@ -62,6 +56,41 @@ def command_poll(force_disaster=False, engine_type='standard'):
         
     print(f"\nSuccess! Generation g{new_g} created.")
 
+def format_stats(stats):
+    """One progress line for a stats record from Evolution.stream."""
+    novelty = stats["novelty"]
+    total = sum(stats["timings"].values())
+    line = (f"📈 g{stats['generation']}: {stats['size']} individuals, "
+            f"novelty {novelty['min']:.3f}/{novelty['mean']:.3f}/{novelty['max']:.3f}, "
+            f"{stats['injected']} injected, {total * 1000:.0f} ms")
+    if stats["disaster"]:
+        line += " 💀"
+    return line
+
+def command_history(args):
+    """
+    Lineage and history queries on the SQLite store (data/mindmutant.db).
+    """
+    from src.deap.sqlite_repository import SQLiteRepository
+
+    repo = SQLiteRepository()
+    try:
+        if args.import_json:
+            print(f"🗄️  Imported {repo.import_json_generations()} generations into {repo.db_path}")
+        if args.first:
+            found = repo.first_appearance(args.first)
+            print(f"'{args.first}' first appeared in g{found['generation']} ({found['id']})" if found
+                  else f"'{args.first}' never appeared.")
+        if args.ancestors:
+            for row in repo.ancestors(args.ancestors):
+                print(f"{'  ' * row['depth']}{row['content']}  (g{row['generation']}, {row['id']})")
+        if args.trend:
+            for row in repo.novelty_trend():
+                novelty = "/".join(f"{row[k]:.3f}" if row[k] is not None else "-" for k in ("min", "mean", "max"))
+                print(f"g{row['generation']}: {row['count']} individuals, novelty {novelty}")
+    finally:
+        repo.close()
+
 def command_now():
     """
     Prints the latest generation number.
@@ -80,12 +109,45 @@ def main():
     new_parser = subparsers.add_parser("new", help="Generate next generation")
     new_parser.add_argument("--engine", default="deap", help="Engine to use (default: deap)")
     new_parser.add_argument("--die", action="store_true", help="Force a disaster event")
+    new_parser.add_argument("--compositional", action="store_true", help="Build sentence vectors from cached token vectors")
+
+    # Run command: Evolve many generations in one process
+    run_parser = subparsers.add_parser("run", help="Evolve several generations in memory")
+    run_parser.add_argument("--generations", type=int, default=10, help="Number of generations to evolve")
+    run_parser.add_argument("--checkpoint-every", type=int, default=10, help="Save and render every K generations")
+    run_parser.add_argument("--die", action="store_true", help="Force a disaster event in the first generation")
+    run_parser.add_argument("--workers", type=int, default=1, help="Worker processes for evaluation and breeding")
+    run_parser.add_argument("--incremental", action="store_true", default=None,
+                            help="Incremental nearest-neighbour novelty (default: on unless --workers > 1 or --ann)")
+    run_parser.add_argument("--no-incremental", dest="incremental", action="store_false", help="Full novelty scan every generation")
+    run_parser.add_argument("--ann", action="store_true", help="Approximate (LSH) nearest-neighbour novelty for large populations")
+    run_parser.add_argument("--compositional", action="store_true", help="Build sentence vectors from cached token vectors")
+    run_parser.add_argument("--selection", default="tournament", choices=["tournament", "roulette", "rank"], help="Parent selection method")
+    run_parser.add_argument("--islands", type=int, default=1, help="Evolve K subpopulations in parallel processes with migration")
+    run_parser.add_argument("--migrate-every", type=int, default=5, help="Generations between island migrations")
+    run_parser.add_argument("--migrants", type=int, default=2, help="Individuals each island sends per migration")
+
+    run_parser.add_argument("--storage", default=None, choices=["json", "binary", "sqlite"], help="Generation storage backend")
+
+    # History command: Queries across generations (SQLite store)
+    history_parser = subparsers.add_parser("history", help="Query lineage and novelty history (SQLite store)")
+    history_parser.add_argument("--import-json", action="store_true", help="Import data/g*/population.json into the database")
+    history_parser.add_argument("--first", metavar="CONTENT", help="Generation in which CONTENT first appeared")
+    history_parser.add_argument("--ancestors", metavar="ID", help="Ancestors of an individual")
+    history_parser.add_argument("--trend", action="store_true", help="Novelty min/mean/max per generation")
+
+    # Now command: Show latest generation
+    subparsers.add_parser("now", help="Show latest generation")
     
     args = parser.parse_args()
+    if args.command == 'run' and args.ann and args.incremental:
+        parser.error("--ann cannot be combined with --incremental")
     
     if args.command == 'poll':
         # Legacy poll command mapping to new evolution logic if needed
         # But for now, let's just use 'new' logic as poll is handled via CSV check inside evolve
+        from src.deap.evolution import Evolution
+
         print("Polling new words...")
         current_g = get_latest_generation()
         
@@ -95,13 +157,49 @@ def main():
         engine.evolve(current_g, force_disaster=args.die)
 
     elif args.command == 'new':
+        from src.deap.evolution import Evolution
+
         current_g = get_latest_generation()
         print(f"Current generation: g{current_g}")
         
         # Always use Evolution (DEAP based)
-        engine = Evolution()
+        engine = Evolution(compositional=args.compositional)
         engine.evolve(current_g, force_disaster=args.die)
 
+    elif args.command == 'run' and args.islands > 1:
+        from src.deap.islands import IslandModel
+
+        current_g = get_latest_generation()
+        print(f"Current generation: g{current_g}")
+
+        model = IslandModel(islands=args.islands, migrate_every=args.migrate_every, migrants=args.migrants,
+                            checkpoint_every=args.checkpoint_every, evolution_kwargs={"selection": args.selection, "storage": args.storage,
+                                              "incremental": args.incremental, "workers": args.workers,
+                                              "compositional": args.compositional, "ann": args.ann})
+        if model.run(current_g, args.generations, force_disaster=args.die) is None:
+            sys.exit(1)
+
+    elif args.command == 'run':
+        from src.deap.evolution import Evolution
+
+        current_g = get_latest_generation()
+        print(f"Current generation: g{current_g}")
+
+        engine = Evolution(workers=args.workers, selection=args.selection, storage=args.storage,
+                           incremental=args.incremental, compositional=args.compositional, ann=args.ann)
+        stream = engine.stream(current_g, args.generations, checkpoint_every=args.checkpoint_every, force_disaster=args.die)
+        try:
+            for stats in stream:
+                print(format_stats(stats))
+        except KeyboardInterrupt:
+            print("\n⏹️  Interrupted; saving the current generation.")
+        finally:
+            stream.close()
+            engine.close()
+
+    elif args.command == 'history':
+        command_history(args)
+
     elif args.command == 'now':
         command_now()
     else:
@@ -0,0 +1,57 @@
+"""
+Benchmark: LSHIndex vs exact search for novelty queries.
+
+Usage: python -m src.bench.ann [--size 1000000] [--dim 96] [--queries 200]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.nlp.ann import LSHIndex
+
+def make_dataset(size: int, dim: int, clusters: int, seed: int = 0) -> np.ndarray:
+    # Clustered data, closer to real embeddings than uniform noise
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, size)
+    data = centers[labels]
+    data += 0.5 * rng.standard_normal((size, dim)).astype(np.float32)
+    return data
+
+def main():
+    parser = argparse.ArgumentParser(description="LSHIndex benchmark")
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--dim", type=int, default=96)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--tables", type=int, default=12)
+    parser.add_argument("--bits", type=int, default=16)
+    args = parser.parse_args()
+
+    data = make_dataset(args.size, args.dim, clusters=max(1, args.size // 100))
+    rng = np.random.default_rng(1)
+    picks = rng.integers(0, args.size, args.queries)
+    queries = data[picks] + 0.2 * rng.standard_normal((args.queries, args.dim)).astype(np.float32)
+
+    index = LSHIndex(args.dim, n_tables=args.tables, n_bits=args.bits)
+    t0 = time.perf_counter()
+    for start in range(0, args.size, 100_000):
+        index.add(data[start:start + 100_000])
+    print(f"Build: {args.size} vectors in {time.perf_counter() - t0:.2f}s")
+
+    t0 = time.perf_counter()
+    exact_idx, _ = index.exact_query(queries, k=args.k)
+    exact_ms = (time.perf_counter() - t0) * 1000 / args.queries
+    print(f"Exact:           {exact_ms:8.3f} ms/query")
+
+    # n_probes is the recall/latency knob
+    for n_probes in (0, 2, 4, 8):
+        t0 = time.perf_counter()
+        approx_idx = np.vstack([index.query(q[None], k=args.k, n_probes=n_probes)[0] for q in queries])
+        approx_ms = (time.perf_counter() - t0) * 1000 / args.queries
+        recall = np.mean([len(set(a) & set(e)) / args.k for a, e in zip(approx_idx, exact_idx)])
+        print(f"LSH n_probes={n_probes}: {approx_ms:8.3f} ms/query  recall@{args.k}={recall:.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: clone + mate throughput and per-instance size of the creator-built
+individual (list with __dict__, cloned with deepcopy) vs the __slots__ Individual.
+
+Usage: python -m src.bench.clone [--pairs 200000] [--length 6]
+"""
+import argparse
+import copy
+import random
+import sys
+import time
+import uuid
+
+from deap import creator
+
+from src.deap.individual import FitnessMax, Individual
+from src.deap.operators import mate_combine
+
+def make_legacy_type():
+    if not hasattr(creator, "LegacyIndividual"):
+        creator.create("LegacyIndividual", list, fitness=FitnessMax, id=str, content=str)
+    return creator.LegacyIndividual
+
+def population(factory, words, size, length):
+    individuals = []
+    for _ in range(size):
+        ind = factory(random.choice(words) for _ in range(length))
+        ind.id = str(uuid.uuid4())
+        ind.fitness.values = (random.random(),)
+        individuals.append(ind)
+    return individuals
+
+def instance_size(ind) -> int:
+    size = sys.getsizeof(ind)
+    if hasattr(ind, "__dict__"):
+        size += sys.getsizeof(ind.__dict__)
+    return size
+
+def main():
+    parser = argparse.ArgumentParser(description="Individual clone benchmark")
+    parser.add_argument("--pairs", type=int, default=200_000)
+    parser.add_argument("--length", type=int, default=6)
+    args = parser.parse_args()
+
+    random.seed(0)
+    words = [f"w{i}" for i in range(300)]
+    legacy = population(make_legacy_type(), words, 1000, args.length)
+    compact = population(Individual, words, 1000, args.length)
+    pairs = [(random.randrange(1000), random.randrange(1000)) for _ in range(args.pairs)]
+
+    # Before: deepcopy both parents, as toolbox.clone did
+    t0 = time.perf_counter()
+    for i, j in pairs:
+        child1, child2 = copy.deepcopy(legacy[i]), copy.deepcopy(legacy[j])
+        mate_combine(child1, child2)
+        del child1.fitness.values
+    before = time.perf_counter() - t0
+
+    # After: shallow clone of the kept child, plain list for the discarded one
+    t0 = time.perf_counter()
+    for i, j in pairs:
+        child1, child2 = compact[i].clone(), list(compact[j])
+        mate_combine(child1, child2)
+        del child1.fitness.values
+    after = time.perf_counter() - t0
+
+    print(f"deepcopy + mate:     {args.pairs / before:12,.0f} children/s  ({instance_size(legacy[0])} bytes/instance)")
+    print(f"slots clone + mate:  {args.pairs / after:12,.0f} children/s  ({instance_size(compact[0])} bytes/instance)")
+    print(f"Speedup: x{before / after:.1f}")
+
+if __name__ == "__main__":
+    main()
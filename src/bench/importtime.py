@@ -0,0 +1,60 @@
+"""
+Benchmark: import time of the CLI and engine modules.
+
+Runs each target in a fresh interpreter with `python -X importtime` and reports
+the total import time plus the heaviest imports, then times `app.py now` end to end.
+
+Usage: python -m src.bench.importtime [--top 10]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TARGETS = [
+    "app",
+    "src.nlp.vectorizer",
+    "src.deap.evolution",
+]
+
+def import_times(module: str):
+    """Returns [(cumulative_us, name)] parsed from -X importtime output."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.rstrip()))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time benchmark")
+    parser.add_argument("--top", type=int, default=10, help="Number of heaviest imports to list")
+    parser.add_argument("--runs", type=int, default=5, help="Runs of `app.py now` to average")
+    args = parser.parse_args()
+
+    for module in TARGETS:
+        rows = import_times(module)
+        total = next((us for us, name in rows if name.strip() == module), 0)
+        print(f"\n{module}: {total / 1000:.1f} ms")
+        # Direct imports of the target; importtime indents each nesting level by two spaces
+        children = [(us, name) for us, name in rows if len(name) - len(name.lstrip()) == 3]
+        for us, name in sorted(children, reverse=True)[:args.top]:
+            print(f"  {us / 1000:8.1f} ms  {name.strip()}")
+
+    elapsed = []
+    for _ in range(args.runs):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "app.py", "now"], cwd=PROJECT_ROOT, capture_output=True)
+        elapsed.append(time.perf_counter() - t0)
+    print(f"\napp.py now: {min(elapsed) * 1000:.1f} ms (best of {args.runs}, includes interpreter startup)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark: batch variation kernels vs the per-individual operators.
+
+Usage: python -m src.bench.kernels [--offspring 100000] [--parents 1000]
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from src.deap.kernels import breed_batch
+from src.deap.mutation import mutate_sentence, CONNECTORS
+from src.deap.operators import mate_combine
+from src.deap.population_store import PopulationStore
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch kernel benchmark")
+    parser.add_argument("--offspring", type=int, default=100_000)
+    parser.add_argument("--parents", type=int, default=1000)
+    parser.add_argument("--vocab", type=int, default=300)
+    args = parser.parse_args()
+
+    random.seed(0)
+    words = [f"w{i}" for i in range(args.vocab)]
+    parents = [[random.choice(words) for _ in range(random.randint(1, 5))] for _ in range(args.parents)]
+    store = PopulationStore()
+    store.append(parents)
+    rng = np.random.default_rng(0)
+    pairs = rng.integers(0, args.parents, (args.offspring, 2))
+
+    t0 = time.perf_counter()
+    for a, b in pairs:
+        child1, child2 = list(parents[a]), list(parents[b])
+        mate_combine(child1, child2)
+        mutate_sentence(child1, all_words_pool=words)
+    serial = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    children = breed_batch(store, pairs, words, CONNECTORS, rng)
+    batch = time.perf_counter() - t0
+
+    print(f"Serial operators: {args.offspring / serial:12,.0f} offspring/s")
+    print(f"Batch kernels:    {args.offspring / batch:12,.0f} offspring/s  (x{serial / batch:.1f})")
+    print(f"Mean length: {children.lengths.mean():.2f} tokens")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Benchmark: incremental nearest-neighbour novelty vs a full all-pairs rescore.
+
+Usage: python -m src.bench.neighbors [--size 50000] [--dim 96] [--change 0.1]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.deap.neighbors import IncrementalNeighbors
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental novelty benchmark")
+    parser.add_argument("--size", type=int, default=50_000)
+    parser.add_argument("--dim", type=int, default=96)
+    parser.add_argument("--change", type=float, default=0.1, help="Fraction of the population replaced")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    keys = [f"ind{i}" for i in range(args.size)]
+    vectors = rng.standard_normal((args.size, args.dim)).astype(np.float32)
+
+    neighbors = IncrementalNeighbors()
+    t0 = time.perf_counter()
+    neighbors.sync(keys, vectors)
+    full = time.perf_counter() - t0
+
+    changed = int(args.size * args.change)
+    replaced = rng.choice(args.size, changed, replace=False)
+    for n, i in enumerate(replaced):
+        keys[i] = f"new{n}"
+    vectors[replaced] = rng.standard_normal((changed, args.dim)).astype(np.float32)
+
+    t0 = time.perf_counter()
+    neighbors.sync(keys, vectors)
+    incremental = time.perf_counter() - t0
+
+    print(f"Full rescore ({args.size:,} rows):   {full:8.2f} s")
+    print(f"Incremental ({changed:,} replaced): {incremental:8.2f} s  ({incremental / full:.0%} of full)")
+    print(f"Rows rescanned after removal: {neighbors.stats['rescanned']:,}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark: parallel novelty evaluation through ProcessPool, 1..N workers.
+
+The population matrix is shared with workers through shared memory. BLAS threads
+are pinned to 1 per process so the speedup comes from the workers alone.
+
+Usage: python -m src.bench.parallel [--size 20000] [--dim 256] [--max-workers 8]
+"""
+import os
+for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ.setdefault(var, "1")
+
+import argparse
+import time
+
+import numpy as np
+
+from src.deap.parallel import ProcessPool
+from src.nlp.vectorizer import Vectorizer
+
+def main():
+    parser = argparse.ArgumentParser(description="ProcessPool scaling benchmark")
+    parser.add_argument("--size", type=int, default=20_000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--block-size", type=int, default=1024)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    normed = Vectorizer.normalize(rng.standard_normal((args.size, args.dim)))
+    print(f"Population: {args.size} x {args.dim}, CPUs available: {os.cpu_count()}")
+
+    workers = 1
+    baseline = None
+    reference = None
+    while workers <= args.max_workers:
+        pool = ProcessPool(workers, block_size=args.block_size)
+        pool.max_similarity(normed[:args.block_size])  # warm up worker processes
+        t0 = time.perf_counter()
+        result = pool.max_similarity(normed)
+        elapsed = time.perf_counter() - t0
+        pool.close()
+
+        if reference is None:
+            baseline, reference = elapsed, result
+        assert np.allclose(result, reference)
+        print(f"workers={workers:3d}: {elapsed:7.2f}s  speedup x{baseline / elapsed:.2f}")
+        workers *= 2
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark: per-generation JSON files vs the single-file binary generation store.
+
+The first part compares the file formats alone; the second times
+Evolution.save_generation end to end (synchronous artifacts, no wordcrowd), which
+is what the engine actually writes per generation with each backend.
+
+Usage: python -m src.bench.storage [--size 200000] [--dim 96] [--engine-size 20000]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from src.deap.generation_file import GenerationFile, write_generation
+from src.deap.population_store import PopulationStore
+
+def save_json(g_dir, records, generation):
+    # Same files and formatting as Repository.save_population/metadata/keywords/situation
+    situation = {"generation": generation,
+                 "analysis": [{"id": r["id"], "content": r["content"], "fitness": r["fitness"]} for r in records]}
+    outputs = {
+        "population.json": records,
+        "metadata.json": {"generation": generation, "count": len(records)},
+        "keywords.json": sorted(set(r["content"] for r in records)),
+        "situation.json": situation,
+    }
+    for name, data in outputs.items():
+        with open(os.path.join(g_dir, name), 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+def bench_engine(size: int):
+    """Seconds and bytes for Evolution.save_generation with the json and binary backends."""
+    # Repository resolves data/ from the working directory at import time
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as root:
+        os.chdir(root)
+        try:
+            from src.deap.evolution import Evolution
+            from deap import creator
+
+            random.seed(0)
+            words = [f"word{i}" for i in range(5000)]
+            results = {}
+            for backend in ("json", "binary"):
+                engine = Evolution(storage=backend, sync_artifacts=True, memo_size=size)
+                population = []
+                for i in range(size):
+                    ind = creator.Individual([random.choice(words) for _ in range(random.randint(1, 6))])
+                    ind.id = f"ind{i}"
+                    ind.fitness.values = (random.random(),)
+                    population.append(ind)
+                # Vectors are already memoized after evaluation in a real run
+                engine.vectorize_population(population)
+
+                t0 = time.perf_counter()
+                engine.save_generation(population, 1)
+                elapsed = time.perf_counter() - t0
+                g_dir = engine.repo.generation_dir(1)
+                results[backend] = (elapsed, sum(os.path.getsize(os.path.join(g_dir, n)) for n in os.listdir(g_dir)),
+                                    sorted(os.listdir(g_dir)))
+                engine.close()
+                shutil.rmtree(os.path.join(root, "data"), ignore_errors=True)
+        finally:
+            os.chdir(cwd)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Generation storage benchmark")
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=96)
+    parser.add_argument("--engine-size", type=int, default=20_000, help="Population size for the save_generation run")
+    args = parser.parse_args()
+
+    random.seed(0)
+    words = [f"word{i}" for i in range(5000)]
+    store = PopulationStore()
+    store.append([[random.choice(words) for _ in range(random.randint(1, 6))] for _ in range(args.size)],
+                 fitness=np.random.default_rng(0).random(args.size))
+    vectors = np.random.default_rng(1).standard_normal((args.size, args.dim)).astype(np.float32)
+
+    with tempfile.TemporaryDirectory() as g_dir:
+        t0 = time.perf_counter()
+        save_json(g_dir, store.to_records(), 1)
+        json_save = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        with open(os.path.join(g_dir, "population.json"), 'r', encoding='utf-8') as f:
+            PopulationStore.from_records(json.load(f))
+        json_load = time.perf_counter() - t0
+        json_bytes = sum(os.path.getsize(os.path.join(g_dir, n)) for n in os.listdir(g_dir))
+
+        path = os.path.join(g_dir, "generation.bin")
+        t0 = time.perf_counter()
+        size = write_generation(path, store, 1, vectors, fsync=False)
+        bin_save = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        GenerationFile(path).store()
+        bin_load = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        GenerationFile(path).read("fitness").max()
+        partial = time.perf_counter() - t0
+
+    print(f"JSON (4 files, no vectors): save {json_save:7.3f} s  load {json_load:7.3f} s  {json_bytes / 1e6:7.1f} MB")
+    print(f"Binary (with vectors):      save {bin_save:7.3f} s  load {bin_load:7.3f} s  {size / 1e6:7.1f} MB")
+    print(f"Binary fitness-only read:   {partial * 1000:.1f} ms")
+    print(f"Speedup: save x{json_save / bin_save:.0f}, load x{json_load / bin_load:.0f}")
+
+    results = bench_engine(args.engine_size)
+    print(f"\nEvolution.save_generation, {args.engine_size} individuals:")
+    for backend, (elapsed, nbytes, files) in results.items():
+        print(f"  {backend:<7} {elapsed:7.3f} s  {nbytes / 1e6:7.1f} MB  {', '.join(files)}")
+    print(f"  Speedup: x{results['json'][0] / results['binary'][0]:.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import os
+import json
+import datetime
+from typing import List, Any, Optional
+
+import numpy as np
+
+from src.nlp.vectorizer import Vectorizer
+
+class NoveltyArchive:
+    """
+    Persistent archive of individuals that died, used as extra novelty reference.
+
+    Layout under archive_dir:
+        vectors.f32   append-only float32 matrix, one row per archived individual
+        archive.jsonl sidecar with one {"id", "content", "generation", "novelty"} record per row
+        archive.json  header with the vector dimension and vector space (vectorizer settings)
+
+    Scoring streams the vector file through a memory map in fixed-size blocks,
+    so memory use does not depend on the archive size.
+
+    Vectors from different vectorizers are not comparable even at the same width:
+    an archive written under another vector space is moved to rotated/<timestamp>/
+    and a new one is started.
+    """
+
+    def __init__(self, archive_dir: str, vector_space: str, max_size: int = 1_000_000, per_generation: int = 25,
+                 min_novelty: float = 0.0, k: int = 1, block_rows: int = 65536):
+        self.archive_dir = archive_dir
+        self.max_size = max_size
+        self.per_generation = per_generation
+        self.min_novelty = min_novelty
+        self.k = k
+        self.block_rows = block_rows
+
+        self.vectors_path = os.path.join(archive_dir, "vectors.f32")
+        self.sidecar_path = os.path.join(archive_dir, "archive.jsonl")
+        self.header_path = os.path.join(archive_dir, "archive.json")
+
+        self.vector_space = vector_space
+        self.dim = None
+        if os.path.exists(self.header_path):
+            with open(self.header_path, 'r', encoding='utf-8') as f:
+                header = json.load(f)
+            self.dim = header["dim"]
+            if header["vector_space"] != vector_space:
+                self._rotate(header["vector_space"])
+
+    def _write_header(self):
+        with open(self.header_path, 'w', encoding='utf-8') as f:
+            json.dump({"dim": self.dim, "vector_space": self.vector_space}, f, indent=2)
+
+    def _rotate(self, stored_space: str):
+        """Moves the archive files aside and starts an empty archive."""
+        rotated = os.path.join(self.archive_dir, "rotated", datetime.datetime.now().strftime("%Y%m%d_%H%M%S"))
+        os.makedirs(rotated, exist_ok=True)
+        for path in (self.vectors_path, self.sidecar_path, self.header_path):
+            if os.path.exists(path):
+                os.replace(path, os.path.join(rotated, os.path.basename(path)))
+        print(f"⚠️  Archive vector space {stored_space} does not match {self.vector_space}. "
+              f"Moved it to {rotated} and started a new archive.")
+        self.dim = None
+
+    def __len__(self) -> int:
+        if self.dim is None or not os.path.exists(self.vectors_path):
+            return 0
+        return os.path.getsize(self.vectors_path) // (4 * self.dim)
+
+    def score(self, vectors: Any, k: Optional[int] = None) -> np.ndarray:
+        """
+        Novelty of each row against the archive: 1.0 minus the mean similarity of its
+        k nearest archived vectors (similarity floored at 0.0). Returns ones if empty.
+        """
+        queries = Vectorizer.normalize(vectors)
+        k = k or self.k
+        size = len(self)
+        if size == 0 or len(queries) == 0:
+            return np.ones(len(queries))
+        if queries.shape[1] != self.dim:
+            print(f"⚠️  Archive dimension {self.dim} does not match vectors ({queries.shape[1]}). Skipping archive.")
+            return np.ones(len(queries))
+
+        k = min(k, size)
+        stored = np.memmap(self.vectors_path, dtype=np.float32, mode='r', shape=(size, self.dim))
+        top = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        for start in range(0, size, self.block_rows):
+            block = Vectorizer.normalize(stored[start:start + self.block_rows])
+            merged = np.concatenate([top, queries @ block.T], axis=1)
+            top = -np.partition(-merged, k - 1, axis=1)[:, :k]
+        del stored
+
+        return 1.0 - np.clip(top.astype(np.float64), 0.0, 1.0).mean(axis=1)
+
+    def admit(self, individuals: List[Any], vectors: Any, novelty: Any, generation: int) -> int:
+        """
+        Appends the most novel individuals to the archive.
+        At most per_generation individuals with novelty >= min_novelty are admitted
+        (one per distinct content), and nothing is admitted once the archive holds max_size entries.
+        Returns the number admitted.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        novelty = np.asarray(novelty, dtype=np.float64)
+        room = min(self.per_generation, self.max_size - len(self))
+        if room <= 0 or len(individuals) == 0:
+            return 0
+
+        order = np.argsort(-novelty, kind="stable")
+        chosen = []
+        seen = set()
+        for i in order:
+            content = " ".join(individuals[i])
+            if novelty[i] < self.min_novelty or content in seen:
+                continue
+            seen.add(content)
+            chosen.append(i)
+            if len(chosen) == room:
+                break
+        if not chosen:
+            return 0
+
+        os.makedirs(self.archive_dir, exist_ok=True)
+        if self.dim is None:
+            self.dim = int(vectors.shape[1])
+            self._write_header()
+        elif vectors.shape[1] != self.dim:
+            print(f"⚠️  Archive dimension {self.dim} does not match vectors ({vectors.shape[1]}). Nothing archived.")
+            return 0
+
+        with open(self.vectors_path, 'ab') as f:
+            f.write(np.ascontiguousarray(vectors[chosen]).tobytes())
+        with open(self.sidecar_path, 'a', encoding='utf-8') as f:
+            for i in chosen:
+                ind = individuals[i]
+                record = {
+                    "id": ind.id,
+                    "content": " ".join(ind),
+                    "generation": generation,
+                    "novelty": float(novelty[i])
+                }
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return len(chosen)
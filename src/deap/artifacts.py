@@ -0,0 +1,130 @@
+"""
+Post-save artifact stage.
+
+After population.json is written, keywords.json, situation.json and
+wordcrowd.html are produced by a single background worker so evolve can return
+immediately. With binary storage only the wordcrowd is rendered (and only when
+asked for); keywords and situation are derived from generation.bin on demand. Progress is recorded in data/g{n}/artifacts.json:
+
+    {"generation": n, "status": "pending" | "running" | "done" | "failed",
+     "artifacts": [...], "error": "...", "updated": "<iso timestamp>"}
+
+The files of one generation are staged and published together with their final
+status (Repository.transaction), so a reader never sees a half-written wordcrowd.
+"""
+import os
+import datetime
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import List, Dict, Any, Optional, Callable
+
+# Set to "1" to render artifacts in the calling thread (tests, scripts that read them right away)
+SYNC_ENV = "MINDMUTANT_SYNC_ARTIFACTS"
+
+class ArtifactStage:
+    """
+    Renders generation artifacts in order on one background thread.
+
+    Args:
+        repo: Repository the artifacts are written to.
+        sync: Render in the calling thread instead (defaults to the MINDMUTANT_SYNC_ARTIFACTS env var).
+        on_complete: Called as on_complete(gen_idx, status) when a generation finishes or fails.
+    """
+
+    def __init__(self, repo: Any, sync: Optional[bool] = None,
+                 on_complete: Optional[Callable[[int, Dict[str, Any]], None]] = None):
+        self.repo = repo
+        self.sync = sync if sync is not None else os.environ.get(SYNC_ENV) == "1"
+        self.on_complete = on_complete
+        self._executor = None if self.sync else ThreadPoolExecutor(max_workers=1, thread_name_prefix="artifacts")
+        self._pending: List[Future] = []
+
+    def submit(self, gen_idx: int, data_list: List[Dict[str, Any]], situation_data: Dict[str, Any],
+               render: bool = True, txn: Optional[Any] = None) -> Optional[Future]:
+        """
+        Queues keywords, situation and (if render) the wordcrowd for a saved generation.
+        In sync mode txn (the generation's open transaction) publishes them together with the population.
+        """
+        if self.sync:
+            if txn is None:
+                self._set_status(gen_idx, "pending")
+            self._run(gen_idx, data_list, situation_data, render, txn)
+            return None
+        self._set_status(gen_idx, "pending")
+        self._pending = [f for f in self._pending if not f.done()]
+        future = self._executor.submit(self._run, gen_idx, data_list, situation_data, render)
+        self._pending.append(future)
+        return future
+
+    def wait(self):
+        """Blocks until every queued generation is rendered."""
+        for future in self._pending:
+            future.result()
+        self._pending = []
+
+    def close(self):
+        if self._executor is not None:
+            self.wait()
+            self._executor.shutdown()
+            self._executor = None
+
+    def _run(self, gen_idx: int, data_list: List[Dict[str, Any]], situation_data: Dict[str, Any], render: bool,
+             txn: Optional[Any] = None):
+        # Without a shared transaction the artifacts get their own, published all at once with their status
+        own = txn is None
+        if own:
+            self._set_status(gen_idx, "running")
+            txn = self.repo.transaction(gen_idx, fsync=False)
+        artifacts = []
+        try:
+            # generation.bin already holds every record; the viewers read it directly
+            if self.repo.backend != "binary":
+                self.repo.save_keywords(gen_idx, data_list, txn=txn)
+                artifacts.append("keywords.json")
+                self.repo.save_situation(gen_idx, situation_data, txn=txn)
+                artifacts.append("situation.json")
+            if render:
+                from src.viz.wordcrowd_generator import generate_wordcrowd
+                generate_wordcrowd(txn.staging_dir, situation_data, verbose=False)
+                if not os.path.exists(os.path.join(txn.staging_dir, "wordcrowd.html")):
+                    raise RuntimeError("wordcrowd.html was not generated")
+                txn.path("wordcrowd.html")
+                artifacts.append("wordcrowd.html")
+                # The staging directory is gone after the commit; report where the file is published
+                published = os.path.join(self.repo.generation_dir(gen_idx), "wordcrowd.html")
+                txn.after_commit.append(lambda: print(f"Word crowd generated: {published}"))
+            status = self._set_status(gen_idx, "done", artifacts, txn=txn)
+            if own:
+                txn.commit()
+        except Exception as e:
+            print(f"⚠️  Artifacts for g{gen_idx} failed: {e}")
+            if own:
+                txn.abort()
+                status = self._set_status(gen_idx, "failed", error=str(e))
+            else:
+                status = self._set_status(gen_idx, "failed", artifacts, error=str(e), txn=txn)
+
+        if self.on_complete is not None:
+            if own:
+                self._complete(gen_idx, status)
+            else:
+                txn.after_commit.append(lambda: self._complete(gen_idx, status))
+        return status
+
+    def _complete(self, gen_idx: int, status: Dict[str, Any]):
+        try:
+            self.on_complete(gen_idx, status)
+        except Exception as e:
+            print(f"⚠️  Artifact callback failed: {e}")
+
+    def _set_status(self, gen_idx: int, status: str, artifacts: Optional[List[str]] = None,
+                    error: Optional[str] = None, txn: Optional[Any] = None) -> Dict[str, Any]:
+        record = {
+            "generation": gen_idx,
+            "status": status,
+            "artifacts": artifacts or [],
+            "updated": datetime.datetime.now().isoformat()
+        }
+        if error is not None:
+            record["error"] = error
+        self.repo.save_artifact_status(gen_idx, record, txn=txn)
+        return record
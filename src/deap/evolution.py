@@ -1,33 +1,98 @@
 import os
 import random
 import json
-import shutil
+import time
 import uuid
-from typing import List, Dict, Any
-from deap import base, creator, tools, algorithms
+from typing import List, Dict, Any, Optional, Callable, Iterator
+import numpy as np
+from deap import base, creator, tools
 
-from src.deap.repository import Repository
+from src.deap.repository import open_repository
+from src.deap.archive import NoveltyArchive
+from src.deap.artifacts import ArtifactStage
+from src.deap.generation_writer import clean_staging
+from src.deap.parallel import ProcessPool
+from src.deap.population_store import PopulationStore
+from src.deap.kernels import breed_batch
+from src.deap.selection import select_parent_pairs
 from src.deap.starvation import Starvation
+from src.deap.memo import FitnessMemo, content_key
+from src.deap.individual import FitnessMax, Individual
+from src.deap.neighbors import IncrementalNeighbors
 from src.nlp.evaluator import Evaluator
 from src.nlp.vectorizer import Vectorizer
-from src.deap.operators import evaluate_novelty, mate_combine
-from src.deap.mutation import mutate_sentence
+from src.nlp.ann import LSHIndex
+from src.deap.operators import evaluate_novelty, evaluate_population, mate_combine
+from src.deap.mutation import mutate_sentence, CONNECTORS
 
-# Define DEAP types
-# Fitness: Maximize Novelty
-if not hasattr(creator, "FitnessMax"):
-    creator.create("FitnessMax", base.Fitness, weights=(1.0,))
-if not hasattr(creator, "Individual"):
-    creator.create("Individual", list, fitness=creator.FitnessMax, id=str, content=str)
+def create_types():
+    """
+    Register the DEAP types in the creator namespace on first use rather than at import time.
+    Individual is the __slots__ type from src.deap.individual (no per-instance __dict__, cheap clone).
+    Fitness: Maximize Novelty
+    """
+    if not hasattr(creator, "FitnessMax"):
+        creator.FitnessMax = FitnessMax
+    if not hasattr(creator, "Individual"):
+        creator.Individual = Individual
 
 class Evolution:
-    def __init__(self, data_dir: str = "data"):
-        self.vectorizer = Vectorizer()
-        self.repo = Repository()
-        self.starvation = Starvation()
+    def __init__(self, data_dir: str = "data", compositional: bool = False, workers: int = 1,
+                 batch_breeding: bool = False, selection: str = "tournament", island: Optional[int] = None,
+                 memo_size: int = 4096, incremental: Optional[bool] = None, sync_artifacts: Optional[bool] = None,
+                 on_artifacts: Optional[Callable[[int, Dict[str, Any]], None]] = None, storage: Optional[str] = None,
+                 ann: bool = False):
+        create_types()
+        self.batch_breeding = batch_breeding
+        self.selection = selection
+        self.island = island
+        self.repo = open_repository(island=island, backend=storage)
+        if island is None:
+            # Staging directories left behind by an interrupted save
+            clean_staging(self.repo.data_dir)
+        # The on-disk vector cache is not shared between island processes
+        cache_dir = os.path.join(self.repo.data_dir, "cache") if island is None else None
+        # Compositional vectors down-weight connectors inserted by mutate_sentence
+        self.vectorizer = Vectorizer(
+            cache_dir=cache_dir,
+            table_dir=os.path.join(self.repo.data_dir, "vectors"),
+            compositional=compositional,
+            connector_words=CONNECTORS
+        )
+        archive_dir = os.path.join(self.repo.data_dir, "archive")
+        if island is not None:
+            archive_dir = os.path.join(archive_dir, f"island{island}")
+        # Archived vectors are only comparable under the same vectorizer settings
+        self.archive = NoveltyArchive(archive_dir, self.vector_space)
+        # Islands get staggered disaster schedules
+        self.starvation = Starvation(phase=island or 0)
+        # Vectors and novelty of repeated contents, kept across generations
+        self.memo = FitnessMemo(capacity=memo_size)
+        # Nearest-neighbour similarities kept up to date as individuals come and go.
+        # Incremental scans run in this process, so with workers the default is the pooled full scan.
+        if incremental is None:
+            incremental = workers <= 1 and not ann
+        if incremental and ann:
+            raise ValueError("Incremental and approximate (ann) novelty cannot be combined.")
+        self.neighbors = IncrementalNeighbors() if incremental else None
+        # Approximate nearest neighbours (LSH) instead of the all-pairs scan, for large populations
+        self.ann = ann
+        # Keywords, situation and wordcrowd are rendered off the critical path
+        self.artifacts = ArtifactStage(self.repo, sync=sync_artifacts, on_complete=on_artifacts)
         self.evaluator = Evaluator(self.vectorizer)
         self.toolbox = base.Toolbox()
+        # Parallel mode: evaluation and variation run on a process pool
+        self.pool = ProcessPool(workers) if workers > 1 else None
         self.setup_toolbox()
+
+    def close(self):
+        """Wait for pending artifacts, shut down the worker pool (if any) and close the repository and vector cache."""
+        self.artifacts.close()
+        self.vectorizer.close()
+        self.repo.close()
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
         
     def setup_toolbox(self):
         # Attribute generator (not used directly for population loading, but needed for new randoms if any)
@@ -39,14 +104,38 @@ class Evolution:
         
         # Operators
         self.toolbox.register("evaluate", evaluate_novelty)
+        self.toolbox.register("evaluate_population", evaluate_population)
         self.toolbox.register("mate", mate_combine)
         # Mutation needs a pool of words. We'll update this alias dynamically or pass it.
         self.toolbox.register("mutate", mutate_sentence, all_words_pool=[]) 
         self.toolbox.register("select", tools.selBest) # Select best novelty
-        # Or tournament: self.toolbox.register("select", tools.selTournament, tournsize=3)
+        if creator.Individual is Individual:
+            # Shallow clone instead of deepcopy
+            self.toolbox.register("clone", Individual.clone)
+        # Parent pairs for breeding: tournament, roulette (alias method) or rank
+        self.toolbox.register("select_pairs", select_parent_pairs, method=self.selection)
+        if self.pool is not None:
+            self.toolbox.register("map", self.pool.map)
+
+    @property
+    def vector_space(self) -> str:
+        """Identifies the vectorizer settings, so stored vectors are only reused by a matching one."""
+        v = self.vectorizer
+        model = v.model_name if v.backend != "hashing" else "-"
+        return f"{v.backend}:{model}:{v.dim}:{'compositional' if v.compositional else 'mean'}"
 
     def load_generation(self, gen_idx: int) -> List[Any]:
-        """Load population from JSON files into DEAP individuals."""
+        """Load population from JSON files (or generation.bin) into DEAP individuals."""
+        reader = self.repo.generation_file(gen_idx)
+        if reader is not None:
+            population = reader.store().to_individuals(creator.Individual)
+            for ind, value in zip(population, reader.read("fitness")):
+                ind.fitness.values = (float(value),)
+            # Stored vectors from the same vectorizer spare re-vectorizing the loaded generation
+            if reader.has("vectors") and reader.header["meta"].get("vector_space") == self.vector_space:
+                self.memo.put_vectors([content_key(ind) for ind in population], reader.vectors())
+            return population
+
         data = self.repo.load_generation(gen_idx)
         population = []
         for item in data:
@@ -55,12 +144,38 @@ class Evolution:
             ind = creator.Individual(words)
             ind.id = item['id']
             ind.content = item['content']
+            ind.parents = tuple(item.get('parents', ()))
             # We might need to re-evaluate fitness later
             population.append(ind)
         return population
 
-    def save_generation(self, population: List[Any], gen_idx: int):
-        """Save DEAP population to JSON files."""
+    def save_generation(self, population: List[Any], gen_idx: int, render: bool = False, txn: Optional[Any] = None):
+        """
+        Save DEAP population to JSON files (or one generation.bin with the binary backend).
+        population.json and metadata.json are published together before returning; keywords,
+        situation and (if render) the wordcrowd go to the artifact stage (into the same
+        commit when artifacts are synchronous). The binary backend only adds the wordcrowd,
+        when rendering.
+        With txn the files are staged into that open transaction and published when the caller commits it.
+        """
+        if txn is None:
+            # Checkpoint: cached vectors are written back with each saved generation
+            self.vectorizer.flush()
+            # Every file of the generation is staged and published in one commit
+            with self.repo.transaction(gen_idx) as txn:
+                self.save_generation(population, gen_idx, render=render, txn=txn)
+            return
+
+        self.repo.archive_injections(txn)
+
+        # The binary backend writes no JSON records; situation is only needed for the wordcrowd
+        binary = self.repo.backend == "binary"
+        if binary and not render:
+            self.repo.save_generation_file(gen_idx, PopulationStore.from_individuals(population),
+                                           self.vectorize_population(population),
+                                           meta={"vector_space": self.vector_space}, txn=txn)
+            return
+
         data_list = []
         situation_list = []
         
@@ -72,13 +187,15 @@ class Evolution:
             # Extract fitness if available
             fitness_val = ind.fitness.values[0] if ind.fitness.valid else 0.0
             
-            item = {
-                "id": ind.id, 
-                "content": content,
-                "fitness": {"novelty": fitness_val},
-                "tags": [] # Legacy support
-            }
-            data_list.append(item)
+            if not binary:
+                item = {
+                    "id": ind.id, 
+                    "content": content,
+                    "fitness": {"novelty": fitness_val},
+                    "tags": [], # Legacy support
+                    "parents": list(getattr(ind, "parents", ()))
+                }
+                data_list.append(item)
             
             situation_list.append({
                 "id": ind.id,
@@ -86,26 +203,85 @@ class Evolution:
                 "fitness": {"novelty": fitness_val}
             })
             
-        self.repo.save_population(gen_idx, data_list)
-        self.repo.save_metadata(gen_idx, len(population))
-        self.repo.save_keywords(gen_idx, data_list)
-        
         # Save situation.json for visualization (with wrapper)
         situation_data = {
             "generation": gen_idx,
             "analysis": situation_list
         }
-        self.repo.save_situation(gen_idx, situation_data)
 
-    def evolve(self, current_g: int, force_disaster: bool = False) -> int:
-        next_g = current_g + 1
-        print(f"🧬 Evolving from g{current_g} to g{next_g} using DEAP...")
-        
-        # 1. Load Population
-        population = self.load_generation(current_g)
-        if not population:
-            print("⚠️  No population found.")
-            return current_g
+        if binary:
+            store = PopulationStore.from_individuals(population)
+            self.repo.save_generation_file(gen_idx, store, self.vectorize_population(population),
+                                           meta={"vector_space": self.vector_space}, txn=txn)
+        else:
+            self.repo.save_population(gen_idx, data_list, txn=txn)
+            self.repo.save_metadata(gen_idx, len(population), txn=txn)
+        if self.artifacts.sync:
+            self.artifacts.submit(gen_idx, data_list, situation_data, render=render, txn=txn)
+        else:
+            # Background artifacts start once the population is published
+            txn.after_commit.append(lambda: self.artifacts.submit(gen_idx, data_list, situation_data, render=render))
+
+    def vectorize_population(self, population: List[Any]):
+        """
+        Vectorize population and return an (N, dim) matrix.
+        Contents already in the memo are reused; the rest are vectorized in one batch.
+        """
+        keys = [content_key(ind) for ind in population]
+        return self.memo.get_vectors(keys, self.evaluator.vectorize_batch)
+
+    def evaluate(self, population: List[Any], vectors: np.ndarray) -> np.ndarray:
+        """
+        Novelty of the population against itself and the archive; writes each fitness.
+        Every distinct content is scored once. Exact duplicates have each other as
+        nearest neighbour, so their novelty is 0.0 as in a full scan.
+        With incremental neighbours only rows that changed since the last call are rescanned.
+        """
+        keys = [content_key(ind) for ind in population]
+        first = {}
+        for i, key in enumerate(keys):
+            first.setdefault(key, i)
+        unique = list(first)
+        rows = list(first.values())
+        position = {key: j for j, key in enumerate(unique)}
+        inverse = np.array([position[key] for key in keys], dtype=np.int64)
+
+        reference = self.memo.reference_key(unique, len(self.archive))
+        unique_novelty = self.memo.get_novelty(unique, reference)
+        if unique_novelty is None:
+            if self.neighbors is not None:
+                unique_novelty = self.neighbors.sync(unique, vectors[rows])
+                if len(self.archive) > 0:
+                    unique_novelty = np.minimum(unique_novelty, self.archive.score(vectors[rows]))
+            else:
+                representatives = [population[i] for i in rows]
+                index = LSHIndex(vectors.shape[1]) if self.ann else None
+                unique_novelty = self.toolbox.evaluate_population(
+                    representatives, vectors[rows], archive=self.archive, pool=self.pool, index=index)
+            self.memo.put_novelty(unique, unique_novelty, reference)
+
+        counts = np.bincount(inverse, minlength=len(unique))
+        novelty = np.where(counts[inverse] > 1, 0.0, unique_novelty[inverse])
+        self.memo.stats["duplicates"] += len(keys) - len(unique)
+        for ind, value in zip(population, novelty):
+            ind.fitness.values = (float(value),)
+        return novelty
+
+    def step(self, population: List[Any], next_g: int, force_disaster: bool = False) -> List[Any]:
+        """
+        Advance an in-memory population by one generation (steps 2-8 of evolve).
+        Returns the next population; nothing is written except archived and injected words.
+        Stats of the generation (see stream) are left in self.last_stats.
+        """
+        self.memo.reset_stats()
+        timings = {}
+        clock = time.perf_counter()
+
+        def lap(stage: str):
+            nonlocal clock
+            now = time.perf_counter()
+            timings[stage] = now - clock
+            clock = now
 
         # 2. Inject New Words (Pollination)
         new_words = self.repo.load_and_archive_injected_words(next_g)
@@ -117,44 +293,108 @@ class Evolution:
                 ind.id = str(uuid.uuid4())
                 ind.content = word
                 population.append(ind)
+        lap("inject")
             
         # 3. Vectorize Population for Evaluation context
-        pop_vectors = {}
+        vectors = self.vectorize_population(population)
+        lap("vectorize")
         all_words_pool = set()
         for ind in population:
-            content = " ".join(ind)
-            pop_vectors[ind.id] = self.evaluator.vectorize(content)
             for w in ind:
                 all_words_pool.add(w)
+        all_words_pool = list(all_words_pool)
         
         # Update mutation pool
-        self.toolbox.register("mutate", mutate_words, all_words_pool=list(all_words_pool))
+        self.toolbox.register("mutate", mutate_sentence, all_words_pool=all_words_pool)
 
         # 4. Evaluate Fitness (Novelty)
-        for ind in population:
-            ind.fitness.values = self.toolbox.evaluate(ind, pop_vectors, self.evaluator)
+        novelty = self.evaluate(population, vectors)
+        rows = {ind.id: i for i, ind in enumerate(population)}
+        evaluated = len(population)
+        lap("evaluate")
 
         print(f"📊 Evaluated {len(population)} individuals.")
 
         # 5. Disaster Event (Selection) via Starvation Component
         survivors = self.starvation.reap_population(population, next_g, force=force_disaster)
+        lap("reap")
+
+        # Archive the dead so their ideas do not come back as "novel"
+        survivor_ids = {ind.id for ind in survivors}
+        dead = [i for i, ind in enumerate(population) if ind.id not in survivor_ids]
+        if dead:
+            dead_rows = [rows[population[i].id] for i in dead]
+            archived = self.archive.admit([population[i] for i in dead], vectors[dead_rows], novelty[dead_rows], next_g)
+            if archived:
+                print(f"🗄️  Archived {archived} individuals ({len(self.archive)} total).")
+        lap("archive")
         
         # 6. Breeding (Offspring Generation)
         target_size = 50 # Max population constraint
         current_size = len(survivors)
         
-        offspring = []
         num_children = target_size - current_size
         if num_children < 0: num_children = 0
+        offspring = self.breed(survivors, num_children, all_words_pool)
+        lap("breed")
+        
+        # 7. Next Generation Population
+        next_population = survivors + offspring
         
-        if num_children > 0 and len(survivors) >= 2:
-            for _ in range(num_children):
-                # Select 2 parents
-                parent1 = self.toolbox.select(survivors, 1)[0]
-                parent2 = self.toolbox.select(survivors, 1)[0]
+        # 8. Max Population Constraint (Final Check)
+        # Only reached when injected words push the survivors past 50; no offspring are bred then,
+        # so every individual already has its novelty from evaluate
+        if len(next_population) > 50:
+            print("✂️  Capping population at 50.")
+            # Select best 50
+            next_population = tools.selBest(next_population, 50)
+        lap("cap")
+
+        print(f"🧠 Memo: {self.memo.report()}")
+        self.last_stats = {
+            "generation": next_g,
+            "size": len(next_population),
+            "evaluated": evaluated,
+            "novelty": {
+                "min": float(novelty.min()) if len(novelty) else 0.0,
+                "mean": float(novelty.mean()) if len(novelty) else 0.0,
+                "max": float(novelty.max()) if len(novelty) else 0.0,
+            },
+            "disaster": len(survivors) < evaluated,
+            "injected": len(new_words),
+            "timings": timings,
+        }
+        return next_population
+
+    def breed(self, survivors: List[Any], num_children: int, all_words_pool: List[str]) -> List[Any]:
+        """Create num_children offspring from survivors (mate + mutate), using the batch kernels or pool if enabled."""
+        if num_children <= 0 or len(survivors) < 2:
+            return []
+
+        # Draw all parent pairs for this generation in one call
+        rng = np.random.default_rng(random.getrandbits(64))
+        fitness = [ind.fitness.values[0] if ind.fitness.valid else 0.0 for ind in survivors]
+        pairs = self.toolbox.select_pairs(fitness, num_children, rng=rng)
+
+        offspring = []
+        if self.batch_breeding:
+            store = PopulationStore.from_individuals(survivors)
+            children = breed_batch(store, pairs, all_words_pool, CONNECTORS, rng)
+            offspring = children.to_individuals(creator.Individual)
+
+        elif self.pool is not None:
+            word_pairs = [(list(survivors[i]), list(survivors[j])) for i, j in pairs]
+            for words in self.pool.breed(word_pairs, all_words_pool):
+                child = creator.Individual(words)
+                child.id = str(uuid.uuid4())
+                offspring.append(child)
+
+        else:
+            for i, j in pairs:
+                parent1, parent2 = survivors[i], survivors[j]
                 
-                # Clone
-                child1, child2 = self.toolbox.clone(parent1), self.toolbox.clone(parent2)
+                # Clone (only child1 is kept, so child2 is a plain word list)
+                child1, child2 = self.toolbox.clone(parent1), list(parent2)
                 
                 # Mate & Mutate
                 self.toolbox.mate(child1, child2)
@@ -165,33 +405,97 @@ class Evolution:
                 del child1.fitness.values # Invalidate fitness
                 
                 offspring.append(child1)
-        
-        # 7. Next Generation Population
-        next_population = survivors + offspring
-        
-        # 8. Max Population Constraint (Final Check)
-        if len(next_population) > 50:
-            print("✂️  Capping population at 50.")
-            # Evaluate new offspring to have valid fitness for comparison
-            # We'll eval them against the survivors (established culture)
-            for ind in offspring:
-                if not ind.fitness.valid:
-                    ind.fitness.values = self.toolbox.evaluate(ind, pop_vectors, self.evaluator)
-            
-            # Select best 50
-            next_population = tools.selBest(next_population, 50)
-            
-        # 9. Save
-        self.save_generation(next_population, next_g)
-        
-        # 10. Visualize (Wordcrowd)
+
+        # Lineage: parent ids, whichever path bred the child
+        for child, (i, j) in zip(offspring, pairs):
+            child.parents = (survivors[i].id, survivors[j].id)
+        return offspring
+
+    def visualize(self, gen_idx: int):
+        """Generate wordcrowd.html for a saved generation."""
         try:
             from src.viz.wordcrowd_generator import generate_wordcrowd
-            g_dir = self.repo.ensure_generation_dir(next_g)
+            g_dir = self.repo.ensure_generation_dir(gen_idx)
             generate_wordcrowd(g_dir)
             print(f"Word crowd generated: {os.path.join(g_dir, 'wordcrowd.html')}")
         except Exception as e:
             print(f"⚠️  Visualization failed: {e}")
+
+    def evolve(self, current_g: int, force_disaster: bool = False) -> int:
+        next_g = current_g + 1
+        print(f"🧬 Evolving from g{current_g} to g{next_g} using DEAP...")
+        
+        # 1. Load Population
+        population = self.load_generation(current_g)
+        if not population:
+            print("⚠️  No population found.")
+            return current_g
+
+        # 2-8. Pollinate, evaluate, reap and breed
+        next_population = self.step(population, next_g, force_disaster=force_disaster)
+            
+        # 9. Save, 10. Visualize (Wordcrowd) in the background
+        self.save_generation(next_population, next_g, render=True)
             
         print(f"\nSuccess! Generation g{next_g} created.")
         return next_g
+
+    def run(self, start_g: int, generations: int, checkpoint_every: int = 10, force_disaster: bool = False) -> int:
+        """
+        Evolve `generations` generations from start_g in one process.
+        Population, vectors and fitness stay in memory between generations; the population is
+        saved and visualized only every checkpoint_every generations and at the end.
+        force_disaster applies to the first generation only.
+        Returns the last generation index.
+        """
+        print(f"🧬 Running {generations} generations from g{start_g} (checkpoint every {checkpoint_every})...")
+        g = start_g
+        for stats in self.stream(start_g, generations, checkpoint_every=checkpoint_every, force_disaster=force_disaster):
+            g = stats["generation"]
+
+        if g == start_g:
+            return start_g
+        print(f"\nSuccess! Generation g{g} created.")
+        return g
+
+    def stream(self, start_g: int, generations: Optional[int] = None, checkpoint_every: int = 10,
+               force_disaster: bool = False, cancel: Any = None) -> Iterator[Dict[str, Any]]:
+        """
+        Evolve from start_g and yield a stats record after each generation:
+        {"generation", "size", "evaluated", "novelty": {"min", "mean", "max"}, "disaster",
+         "injected", "timings": {stage: seconds}, "saved"}.
+
+        Runs until `generations` generations are done (forever if None), cancel.is_set()
+        is true (e.g. a threading.Event) or the generator is closed. Only the current
+        population is kept; the last generation is always saved when the stream ends.
+        """
+        population = self.load_generation(start_g)
+        if not population:
+            print("⚠️  No population found.")
+            return
+
+        g = start_g
+        saved = g
+        try:
+            i = 0
+            while generations is None or i < generations:
+                if cancel is not None and cancel.is_set():
+                    print(f"⏹️  Cancelled after g{g}.")
+                    break
+                population = self.step(population, g + 1, force_disaster=force_disaster and i == 0)
+                g += 1
+                i += 1
+
+                stats = self.last_stats
+                if (checkpoint_every > 0 and i % checkpoint_every == 0) or i == generations:
+                    started = time.perf_counter()
+                    self.save_generation(population, g, render=True)
+                    stats["timings"]["save"] = time.perf_counter() - started
+                    saved = g
+                    print(f"💾 Checkpoint g{g} saved.")
+                stats["saved"] = saved == g
+                yield stats
+        finally:
+            if saved != g:
+                self.save_generation(population, g, render=True)
+                print(f"💾 Checkpoint g{g} saved.")
@@ -0,0 +1,184 @@
+"""
+Single-file binary generation store.
+
+One file per generation (data/g{n}/generation.bin) holding columnar arrays:
+
+    magic     8 bytes  b"MMGEN\\x00\\x01\\x00"
+    length    uint64   byte length of the JSON header
+    header    JSON     {"version", "generation", "count", "timestamp", "dim",
+                        "raw_ids", "meta", "sections": {name: {"offset", "nbytes", "dtype", "shape"}}}
+    sections  64-byte aligned, offsets relative to the end of the (aligned) header:
+              uuids (n, 16) uint8, offsets (n + 1,) int64, values int32, fitness float64,
+              parents (n, 2) int32, parent_uuids (n, 2, 16) uint8 (lineage, all zero if none),
+              vectors (n, dim) float32 (optional), vocab (UTF-8, newline separated)
+    Non-UUID ids live in the header: raw_ids {row: id} and raw_parent_ids {"row:slot": id}.
+
+The header is read on its own, and each section is memory-mapped on demand, so a
+reader that wants only fitness or only the first rows does not touch the rest.
+export_json writes the classic population/metadata/keywords/situation JSON layout.
+
+Usage: python -m src.deap.generation_file g13 [--data-dir data]  (exports JSON next to the file)
+"""
+import os
+import sys
+import json
+import struct
+import datetime
+import argparse
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from src.deap.population_store import PopulationStore, Vocabulary
+
+MAGIC = b"MMGEN\x00\x01\x00"
+VERSION = 1
+FILENAME = "generation.bin"
+ALIGN = 64
+
+def _aligned(n: int) -> int:
+    return -(-n // ALIGN) * ALIGN
+
+def write_generation(path: str, store: PopulationStore, generation: int, vectors: Optional[np.ndarray] = None,
+                     meta: Optional[Dict[str, Any]] = None, fsync: bool = True) -> int:
+    """
+    Writes store (and optional (n, dim) vectors) to path atomically. Returns the file size.
+    meta is stored in the header as-is (e.g. which vectorizer produced the vectors).
+    """
+    vocab = "\n".join(store.vocab.tokens).encode('utf-8')
+    arrays = {
+        "uuids": np.ascontiguousarray(store.uuids, dtype=np.uint8),
+        "offsets": np.ascontiguousarray(store.offsets, dtype=np.int64),
+        "values": np.ascontiguousarray(store.values, dtype=np.int32),
+        "fitness": np.ascontiguousarray(store.fitness, dtype=np.float64),
+        "parents": np.ascontiguousarray(store.parents, dtype=np.int32),
+        "parent_uuids": np.ascontiguousarray(store.parent_uuids, dtype=np.uint8),
+        "vocab": np.frombuffer(vocab, dtype=np.uint8),
+    }
+    if vectors is not None:
+        arrays["vectors"] = np.ascontiguousarray(vectors, dtype=np.float32).reshape(len(store), -1)
+
+    sections = {}
+    position = 0
+    for name, array in arrays.items():
+        sections[name] = {"offset": position, "nbytes": array.nbytes, "dtype": array.dtype.str, "shape": list(array.shape)}
+        position = _aligned(position + array.nbytes)
+
+    header = json.dumps({
+        "version": VERSION,
+        "generation": generation,
+        "count": len(store),
+        "timestamp": datetime.datetime.now().isoformat(),
+        "dim": int(arrays["vectors"].shape[1]) if "vectors" in arrays else None,
+        "raw_ids": {str(row): raw for row, raw in store.raw_ids.items()},
+        "raw_parent_ids": {f"{row}:{slot}": raw for (row, slot), raw in store.raw_parent_ids.items()},
+        "meta": meta or {},
+        "sections": sections,
+    }, ensure_ascii=False).encode('utf-8')
+    data_start = _aligned(len(MAGIC) + 8 + len(header))
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        for name, array in arrays.items():
+            f.seek(data_start + sections[name]["offset"])
+            f.write(array.tobytes())
+        f.truncate(data_start + position)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return data_start + position
+
+class GenerationFile:
+    """Reader for generation.bin; sections are memory-mapped lazily."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a generation file")
+            (length,) = struct.unpack('<Q', f.read(8))
+            self.header = json.loads(f.read(length).decode('utf-8'))
+        self.data_start = _aligned(len(MAGIC) + 8 + length)
+
+    def __len__(self) -> int:
+        return self.header["count"]
+
+    @property
+    def generation(self) -> int:
+        return self.header["generation"]
+
+    def has(self, name: str) -> bool:
+        return name in self.header["sections"]
+
+    def read(self, name: str) -> np.ndarray:
+        """Memory-mapped, read-only view of a section (slice it to read part of it)."""
+        section = self.header["sections"][name]
+        shape = tuple(section["shape"])
+        if section["nbytes"] == 0:
+            return np.zeros(shape, dtype=np.dtype(section["dtype"]))
+        return np.memmap(self.path, dtype=np.dtype(section["dtype"]), mode='r',
+                         offset=self.data_start + section["offset"], shape=shape)
+
+    def vocabulary(self) -> List[str]:
+        raw = self.read("vocab").tobytes().decode('utf-8')
+        return raw.split("\n") if raw else []
+
+    def store(self, vocab: Optional[Vocabulary] = None) -> PopulationStore:
+        """Loads the population as a PopulationStore, re-interning tokens into vocab if given."""
+        tokens = self.vocabulary()
+        store = PopulationStore(vocab if vocab is not None else Vocabulary(tokens))
+        values = np.array(self.read("values"))
+        if vocab is not None and len(values):
+            values = vocab.intern_many(tokens)[values]
+        store.values = values
+        store.offsets = np.array(self.read("offsets"))
+        store.fitness = np.array(self.read("fitness"))
+        store.uuids = np.array(self.read("uuids"))
+        store.parents = np.array(self.read("parents"))
+        store.raw_ids = {int(row): raw for row, raw in self.header["raw_ids"].items()}
+        store.parent_uuids = np.array(self.read("parent_uuids"))
+        store.raw_parent_ids = {tuple(int(part) for part in key.split(":")): raw
+                                for key, raw in self.header["raw_parent_ids"].items()}
+        return store
+
+    def vectors(self) -> Optional[np.ndarray]:
+        return np.array(self.read("vectors")) if self.has("vectors") else None
+
+    def records(self) -> List[Dict[str, Any]]:
+        """population.json records."""
+        return self.store().to_records()
+
+def export_json(path: str, out_dir: Optional[str] = None) -> str:
+    """Writes population.json, metadata.json, keywords.json and situation.json for a generation file."""
+    reader = GenerationFile(path)
+    out_dir = out_dir or os.path.dirname(path)
+    records = reader.records()
+    outputs = {
+        "population.json": records,
+        "metadata.json": {"generation": reader.generation, "count": len(reader), "timestamp": reader.header["timestamp"]},
+        "keywords.json": sorted(set(r["content"] for r in records)),
+        "situation.json": {
+            "generation": reader.generation,
+            "analysis": [{"id": r["id"], "content": r["content"], "fitness": r["fitness"]} for r in records]
+        },
+    }
+    os.makedirs(out_dir, exist_ok=True)
+    for name, data in outputs.items():
+        with open(os.path.join(out_dir, name), 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    return out_dir
+
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+    parser = argparse.ArgumentParser(description="Export a binary generation file to the JSON layout")
+    parser.add_argument("generation", help="Generation directory name, e.g. g13")
+    parser.add_argument("--data-dir", default="data", help="Data directory")
+    args = parser.parse_args()
+
+    g_dir = os.path.join(args.data_dir, args.generation)
+    print(f"Exported {export_json(os.path.join(g_dir, FILENAME))}")
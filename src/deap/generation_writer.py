@@ -0,0 +1,180 @@
+"""
+Transactional generation writer.
+
+Every file of a save is written into a staging directory in data/
+(data/.g{n}.<random>.staging/, same filesystem) and published together on commit:
+
+- if data/g{n}/ does not exist yet, the staging directory is renamed onto it
+  in one atomic rename. This is the normal path: archived addwords files and
+  island checkpoints are moved into the generation's staging directory (adopt)
+  instead of creating data/g{n}/ ahead of the save;
+- if it already exists (a generation is re-saved), each staged entry replaces
+  its counterpart with an atomic rename.
+
+Either way no reader sees a partially written file, and the manifest is only
+updated after the commit (after_commit callbacks), so get_latest_generation never
+points at a half-written generation. Leftover staging directories from a crash
+are removed by clean_staging.
+"""
+import io
+import os
+import json
+import time
+import shutil
+import tempfile
+from typing import List, Any, Callable, Optional
+
+STAGING_PREFIX = "."
+
+def _fsync_dir(path: str):
+    # Directory fsync persists renames; not supported on Windows
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def clean_staging(parent_dir: str, max_age: float = 3600.0) -> int:
+    """Removes staging directories left by crashed writers (older than max_age seconds). Returns the count."""
+    if not os.path.isdir(parent_dir):
+        return 0
+    removed = 0
+    now = time.time()
+    for name in os.listdir(parent_dir):
+        path = os.path.join(parent_dir, name)
+        if name.startswith(STAGING_PREFIX) and name.endswith(".staging") and os.path.isdir(path):
+            try:
+                if now - os.path.getmtime(path) > max_age:
+                    shutil.rmtree(path, ignore_errors=True)
+                    removed += 1
+            except OSError:
+                pass
+    return removed
+
+class GenerationWriter:
+    """
+    Stages files for one generation directory and publishes them atomically.
+
+    Use as a context manager: commits on success, discards the staging directory on error.
+
+    Args:
+        target_dir: Final directory (data/g{n}/ or data/g{n}/island{k}/).
+        fsync: fsync every staged file and the directories before publishing.
+        staging_root: Directory for the staging directory (defaults to the parent of
+            target_dir); must be on the same filesystem.
+    """
+
+    def __init__(self, target_dir: str, fsync: bool = True, staging_root: Optional[str] = None):
+        self.target_dir = target_dir
+        self.fsync = fsync
+        staging_root = staging_root or os.path.dirname(target_dir)
+        os.makedirs(staging_root, exist_ok=True)
+        self.staging_dir = tempfile.mkdtemp(
+            prefix=f"{STAGING_PREFIX}{os.path.basename(target_dir)}.", suffix=".staging", dir=staging_root)
+        self.files: List[str] = []
+        self.after_commit: List[Callable[[], Any]] = []
+        # One text buffer and encoder reused for every JSON file of the transaction
+        self._buffer = io.StringIO()
+        self._encoders = {}
+        self.committed = False
+
+    def path(self, name: str) -> str:
+        """Staging path for a file that another writer (e.g. write_generation) produces itself."""
+        if name not in self.files:
+            self.files.append(name)
+        return os.path.join(self.staging_dir, name)
+
+    def adopt(self, path: str, name: str):
+        """Moves an existing file or directory (e.g. a detached island transaction) into the staging directory."""
+        os.rename(path, self.path(name))
+
+    def write_json(self, name: str, data: Any, indent: Optional[int] = 2, ensure_ascii: bool = False) -> str:
+        key = (indent, ensure_ascii)
+        encoder = self._encoders.get(key)
+        if encoder is None:
+            encoder = self._encoders[key] = json.JSONEncoder(indent=indent, ensure_ascii=ensure_ascii)
+        buffer = self._buffer
+        buffer.seek(0)
+        buffer.truncate()
+        for chunk in encoder.iterencode(data):
+            buffer.write(chunk)
+
+        filepath = self.path(name)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(buffer.getvalue())
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        return filepath
+
+    def sync(self):
+        """fsyncs the staged files (including those written by other writers through path()) and the staging directory."""
+        for name in self.files:
+            filepath = os.path.join(self.staging_dir, name)
+            if os.path.isfile(filepath):
+                with open(filepath, 'rb') as f:
+                    os.fsync(f.fileno())
+            elif os.path.isdir(filepath):
+                _fsync_dir(filepath)
+        _fsync_dir(self.staging_dir)
+
+    def detach(self) -> str:
+        """
+        Hands the staged directory over to another transaction (see adopt) instead of publishing it.
+        Returns its path; after_commit callbacks are dropped.
+        """
+        if self.fsync:
+            self.sync()
+        self.committed = True
+        self.after_commit = []
+        return self.staging_dir
+
+    def commit(self) -> List[str]:
+        """Publishes the staged files. Returns their final paths."""
+        if self.committed:
+            return [os.path.join(self.target_dir, name) for name in self.files]
+        if self.fsync:
+            self.sync()
+
+        published = False
+        if not os.path.exists(self.target_dir):
+            os.makedirs(os.path.dirname(self.target_dir), exist_ok=True)
+            try:
+                os.rename(self.staging_dir, self.target_dir)
+                published = True
+            except OSError:
+                # Another writer created the directory first: fall back to per-entry renames
+                pass
+        if not published:
+            for name in os.listdir(self.staging_dir):
+                target = os.path.join(self.target_dir, name)
+                # Directories (island checkpoints) cannot be replaced by rename while they hold files
+                if os.path.isdir(target) and not os.path.islink(target):
+                    shutil.rmtree(target)
+                os.replace(os.path.join(self.staging_dir, name), target)
+            os.rmdir(self.staging_dir)
+        if self.fsync:
+            _fsync_dir(self.target_dir)
+            _fsync_dir(os.path.dirname(self.target_dir))
+        self.committed = True
+
+        for callback in self.after_commit:
+            callback()
+        return [os.path.join(self.target_dir, name) for name in self.files]
+
+    def abort(self):
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+
+    def __enter__(self) -> "GenerationWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
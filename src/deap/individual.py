@@ -0,0 +1,59 @@
+"""
+Compact individual type.
+
+A list of words with __slots__ for fitness, id and parents (ids of the two
+parents, empty for loaded or injected individuals), so instances carry no
+per-instance __dict__. content is derived from the words on access instead of
+being stored. clone() copies the word list (words are immutable strings, so the
+copy shares them) and the fitness values tuple, replacing DEAP's deepcopy.
+"""
+from typing import Iterable, Tuple
+
+from deap import base
+
+class FitnessMax(base.Fitness):
+    """Maximize Novelty."""
+    weights = (1.0,)
+
+class Individual(list):
+    __slots__ = ("fitness", "id", "parents")
+
+    def __init__(self, words: Iterable[str] = (), id: str = "", parents: Tuple[str, ...] = ()):
+        super().__init__(words)
+        self.fitness = FitnessMax()
+        self.id = id
+        self.parents = parents
+
+    @property
+    def content(self) -> str:
+        return " ".join(self)
+
+    @content.setter
+    def content(self, value: str):
+        # Kept for callers that assign content; the words stay the source of truth
+        words = value.split()
+        if words != self:
+            self[:] = words
+
+    def clone(self) -> "Individual":
+        """Copy sharing the word strings; fitness values are copied, so invalidating the clone's fitness is safe."""
+        child = Individual.__new__(Individual)
+        list.__init__(child, self)
+        fitness = FitnessMax.__new__(FitnessMax)
+        fitness.wvalues = self.fitness.wvalues
+        child.fitness = fitness
+        child.id = self.id
+        child.parents = self.parents
+        return child
+
+    def __copy__(self) -> "Individual":
+        return self.clone()
+
+    def __deepcopy__(self, memo) -> "Individual":
+        return self.clone()
+
+    def __reduce__(self):
+        return (Individual, (list(self), self.id, self.parents), {"wvalues": self.fitness.wvalues})
+
+    def __setstate__(self, state):
+        self.fitness.wvalues = state["wvalues"]
@@ -0,0 +1,212 @@
+"""
+Island-model evolution.
+
+K subpopulations evolve in separate processes, each with its own Evolution
+(staggered Starvation schedule, own archive, own mutation word pool drawn from
+its own individuals). Every migrate_every generations each island sends copies
+of its top individuals to the next island in a ring and replaces its worst
+individuals with the ones it receives. Seeded and immigrant individuals get
+fresh ids (the previous id becomes their parent), so ids stay unique across islands.
+
+Per-island checkpoints go to data/g{n}/island{k}/; the best individuals across
+all islands are merged into data/g{n}/ so the viewers keep working unchanged.
+Islands stage their checkpoint without publishing it, and the merging process
+adopts the staged island directories into the generation's transaction, so
+data/g{n}/ appears with one rename.
+"""
+import uuid
+import random
+import multiprocessing as mp
+from queue import Empty
+from typing import List, Dict, Any, Optional
+
+from deap import creator, tools
+
+# Seconds an island waits for its neighbour's migrants before giving up on this round
+MIGRATION_TIMEOUT = 600
+
+def individual_records(population: List[Any]) -> List[Dict[str, Any]]:
+    """Plain picklable records (words, id, novelty) for sending individuals between processes."""
+    return [
+        {"words": list(ind), "id": ind.id, "novelty": ind.fitness.values[0] if ind.fitness.valid else 0.0,
+         "parents": list(getattr(ind, "parents", ()))}
+        for ind in population
+    ]
+
+def individuals_from_records(records: List[Dict[str, Any]]) -> List[Any]:
+    population = []
+    for record in records:
+        ind = creator.Individual(record["words"])
+        ind.id = record["id"]
+        ind.content = " ".join(ind)
+        ind.fitness.values = (record["novelty"],)
+        ind.parents = tuple(record.get("parents", ()))
+        population.append(ind)
+    return population
+
+def reassign_ids(population: List[Any]) -> List[Any]:
+    """
+    Gives individuals fresh ids, keeping the previous id as their parent for lineage.
+    Used for seeded islands and immigrants so no id lives on two islands at once.
+    """
+    for ind in population:
+        ind.parents = (ind.id,) if ind.id else ()
+        ind.id = str(uuid.uuid4())
+    return population
+
+def merge_best(population: List[Any], k: int) -> List[Any]:
+    """Best k individuals with distinct contents and ids (islands can hold copies of the same migrant)."""
+    merged = []
+    seen_contents = set()
+    seen_ids = set()
+    for ind in tools.selBest(population, len(population)):
+        content = " ".join(ind)
+        if content in seen_contents or ind.id in seen_ids:
+            continue
+        seen_contents.add(content)
+        seen_ids.add(ind.id)
+        merged.append(ind)
+        if len(merged) == k:
+            break
+    return merged
+
+def migrate(population: List[Any], immigrants: List[Any]) -> List[Any]:
+    """Replaces the worst individuals of population with immigrants."""
+    if not immigrants:
+        return population
+    keep = max(0, len(population) - len(immigrants))
+    return tools.selBest(population, keep) + immigrants
+
+def run_island(island: int, start_g: int, generations: int, migrate_every: int, migrants: int,
+               checkpoint_every: int, seed: int, inbox, outbox, results, evolution_kwargs: Dict[str, Any],
+               force_disaster: bool = False):
+    """Worker process: evolves one island, exchanging migrants through inbox/outbox."""
+    from src.deap.evolution import Evolution
+
+    random.seed(seed)
+    # Island artifacts (keywords, situation) must land in the staged checkpoint, not after a commit
+    engine = Evolution(island=island, **{**evolution_kwargs, "sync_artifacts": True})
+    try:
+        # Resume from this island's own state if present, else start from the shared generation
+        population = engine.load_generation(start_g)
+        if not population:
+            engine.repo.island = None
+            population = reassign_ids(engine.load_generation(start_g))
+            engine.repo.island = island
+        if not population:
+            results.put(("done", island, None, [], None))
+            return
+
+        g = start_g
+        for i in range(generations):
+            g += 1
+            population = engine.step(population, g, force_disaster=force_disaster and i == 0)
+
+            if migrate_every > 0 and (i + 1) % migrate_every == 0 and i < generations - 1:
+                outbox.put(individual_records(tools.selBest(population, migrants)))
+                try:
+                    immigrants = reassign_ids(individuals_from_records(inbox.get(timeout=MIGRATION_TIMEOUT)))
+                except Empty:
+                    print(f"⚠️  Island {island}: no migrants arrived at g{g}.")
+                    immigrants = []
+                population = migrate(population, immigrants)
+                print(f"🏝️  Island {island}: {len(immigrants)} migrants arrived at g{g}.")
+
+            if (checkpoint_every > 0 and (i + 1) % checkpoint_every == 0) or i == generations - 1:
+                txn = engine.repo.transaction(g)
+                try:
+                    engine.save_generation(population, g, txn=txn)
+                except Exception:
+                    txn.abort()
+                    raise
+                results.put(("checkpoint", island, g, individual_records(population), txn.detach()))
+
+        results.put(("done", island, g, [], None))
+    finally:
+        engine.close()
+
+class IslandModel:
+    """
+    Runs `islands` subpopulations in parallel processes with ring migration.
+
+    Args:
+        islands: Number of subpopulations (one process each).
+        migrate_every: Generations between migrations.
+        migrants: Top individuals each island sends per migration.
+        checkpoint_every: Generations between saved checkpoints.
+        evolution_kwargs: Extra Evolution arguments for every island (e.g. selection, workers).
+    """
+
+    def __init__(self, islands: int = 4, migrate_every: int = 5, migrants: int = 2,
+                 checkpoint_every: int = 10, evolution_kwargs: Optional[Dict[str, Any]] = None):
+        self.islands = islands
+        self.migrate_every = migrate_every
+        self.migrants = migrants
+        self.checkpoint_every = checkpoint_every
+        self.evolution_kwargs = evolution_kwargs or {}
+
+    def run(self, start_g: int, generations: int, force_disaster: bool = False) -> Optional[int]:
+        """
+        Evolves every island for `generations` generations from start_g.
+        force_disaster applies to the first generation of every island.
+        Returns the last merged generation index, or None if no checkpoint was merged.
+        """
+        from src.deap.evolution import Evolution
+
+        print(f"🧬 Running {self.islands} islands for {generations} generations from g{start_g} "
+              f"(migration every {self.migrate_every})...")
+        inboxes = [mp.Queue() for _ in range(self.islands)]
+        results = mp.Queue()
+        seed = random.getrandbits(32)
+        processes = [
+            mp.Process(
+                target=run_island,
+                args=(k, start_g, generations, self.migrate_every, self.migrants, self.checkpoint_every,
+                      seed + k, inboxes[k], inboxes[(k + 1) % self.islands], results, self.evolution_kwargs,
+                      force_disaster)
+            )
+            for k in range(self.islands)
+        ]
+        for process in processes:
+            process.start()
+
+        # Merge each checkpoint once every island has reported it (the merger only saves, so no worker pool)
+        merger = Evolution(**{**self.evolution_kwargs, "workers": 1})
+        checkpoints: Dict[int, List[Any]] = {}
+        staged: Dict[int, Dict[int, str]] = {}
+        reported: Dict[int, int] = {}
+        last_g = None
+        done = 0
+        try:
+            while done < self.islands:
+                try:
+                    kind, island, g, records, staged_dir = results.get(timeout=1)
+                except Empty:
+                    if not any(p.is_alive() for p in processes):
+                        print("⚠️  Island processes exited early.")
+                        break
+                    continue
+                if kind == "done":
+                    done += 1
+                    continue
+                checkpoints.setdefault(g, []).extend(individuals_from_records(records))
+                staged.setdefault(g, {})[island] = staged_dir
+                reported[g] = reported.get(g, 0) + 1
+                if reported[g] == self.islands:
+                    population = merge_best(checkpoints.pop(g), 50)
+                    with merger.repo.transaction(g) as txn:
+                        for k, staged_dir in sorted(staged.pop(g).items()):
+                            txn.adopt(staged_dir, f"island{k}")
+                        merger.save_generation(population, g, render=True, txn=txn)
+                    last_g = g if last_g is None else max(last_g, g)
+                    print(f"💾 Checkpoint g{g} merged from {self.islands} islands.")
+        finally:
+            for process in processes:
+                process.join()
+            merger.close()
+
+        if last_g is None:
+            print(f"\n⚠️  No island produced a population from g{start_g}; nothing was written.")
+        else:
+            print(f"\nSuccess! Generation g{last_g} created.")
+        return last_g
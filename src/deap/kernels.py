@@ -0,0 +1,139 @@
+"""
+Batch variation kernels on token-id populations.
+
+Vectorized counterparts of operators.mate_combine and mutation.mutate_sentence for a
+whole offspring batch at once. Individuals are ragged int32 arrays: individual i is
+values[offsets[i]:offsets[i + 1]]. Probabilities match the per-individual operators.
+"""
+from typing import Tuple, List
+
+import numpy as np
+
+from src.deap.population_store import PopulationStore
+
+# mutate_sentence structure actions, chosen uniformly
+INSERT_CONNECTOR, APPEND_PHRASE, PREPEND_PHRASE = 0, 1, 2
+
+def _segments(offsets: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns (lengths, segment id per element, position within segment per element)."""
+    lengths = np.diff(offsets)
+    seg = np.repeat(np.arange(len(lengths)), lengths)
+    local = np.arange(offsets[-1]) - np.repeat(offsets[:-1], lengths)
+    return lengths, seg, local
+
+def gather(values: np.ndarray, offsets: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Gathers individuals rows (may repeat) into a new ragged array."""
+    lengths = np.diff(offsets)[rows]
+    new_offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+    index = np.repeat(offsets[rows] - new_offsets[:-1], lengths) + np.arange(new_offsets[-1])
+    return values[index], new_offsets
+
+def mate_batch(values: np.ndarray, offsets: np.ndarray, pairs: np.ndarray, rng: np.random.Generator,
+               void_id: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Set-mix crossover for every pair: the parents' distinct tokens are shuffled and the
+    child keeps a random non-empty prefix (first child of mate_combine).
+    Returns the children as (values, offsets).
+    """
+    n = len(pairs)
+    if n == 0:
+        return np.zeros(0, dtype=np.int32), np.zeros(1, dtype=np.int64)
+
+    # Concatenate parent1 + parent2 tokens per child
+    interleaved = np.column_stack([pairs[:, 0], pairs[:, 1]]).ravel()
+    joined, joined_offsets = gather(values, offsets, interleaved)
+    child_offsets = joined_offsets[::2]
+    _, seg, _ = _segments(child_offsets)
+
+    # Distinct tokens per child, then shuffle within each child
+    order = np.lexsort((joined, seg))
+    s_seg, s_tok = seg[order], joined[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = (s_seg[1:] != s_seg[:-1]) | (s_tok[1:] != s_tok[:-1])
+    u_seg, u_tok = s_seg[first], s_tok[first]
+    shuffle = np.lexsort((rng.random(len(u_seg)), u_seg))
+    u_seg, u_tok = u_seg[shuffle], u_tok[shuffle]
+
+    # Split point in [1, m - 1] for m > 1, otherwise keep everything
+    m = np.bincount(u_seg, minlength=n)
+    split = m.copy()
+    many = m > 1
+    split[many] = rng.integers(1, m[many])
+    u_offsets = np.concatenate([[0], np.cumsum(m)])
+    rank = np.arange(len(u_seg)) - u_offsets[u_seg]
+    keep = rank < split[u_seg]
+
+    out_lengths = np.maximum(split, 1)
+    out_offsets = np.concatenate([[0], np.cumsum(out_lengths)]).astype(np.int64)
+    out = np.full(out_offsets[-1], void_id, dtype=np.int32)
+    out[out_offsets[u_seg[keep]] + rank[keep]] = u_tok[keep]
+    return out, out_offsets
+
+def mutate_batch(values: np.ndarray, offsets: np.ndarray, pool_ids: np.ndarray, connector_ids: np.ndarray,
+                 rng: np.random.Generator, indpb: float = 0.2) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batch mutate_sentence: per-token replacement from pool_ids with probability indpb, then
+    with probability indpb one structure action per individual (connector insertion between
+    two non-connector words, or connector + word appended / word + connector prepended).
+    Returns the mutated individuals as (values, offsets).
+    """
+    values = values.astype(np.int32, copy=True)
+    lengths, seg, local = _segments(offsets)
+    n = len(lengths)
+    has_pool = len(pool_ids) > 0
+
+    # 1. Standard Word Replacement
+    if has_pool:
+        replace = rng.random(len(values)) < indpb
+        values[replace] = pool_ids[rng.integers(0, len(pool_ids), replace.sum())]
+
+    # 2. Structure Mutation
+    act = rng.random(n) < indpb
+    action = rng.integers(0, 3, n)
+    connector = connector_ids[rng.integers(0, len(connector_ids), n)]
+    new_word = pool_ids[rng.integers(0, len(pool_ids), n)] if has_pool else np.zeros(n, dtype=np.int32)
+
+    idx = rng.integers(1, np.maximum(lengths, 2))
+    insert = act & (action == INSERT_CONNECTOR) & (lengths >= 2)
+    if insert.any():
+        # Avoid double connectors
+        left = values[offsets[:-1][insert] + idx[insert] - 1]
+        right = values[offsets[:-1][insert] + idx[insert]]
+        ok = ~np.isin(left, connector_ids) & ~np.isin(right, connector_ids)
+        insert[np.flatnonzero(insert)[~ok]] = False
+    append = act & (action == APPEND_PHRASE) & has_pool
+    prepend = act & (action == PREPEND_PHRASE) & has_pool
+
+    extra = insert.astype(np.int64) + 2 * append + 2 * prepend
+    new_offsets = np.concatenate([[0], np.cumsum(lengths + extra)]).astype(np.int64)
+    out = np.empty(new_offsets[-1], dtype=np.int32)
+
+    shift = 2 * prepend[seg] + (insert[seg] & (local >= idx[seg]))
+    out[new_offsets[seg] + local + shift] = values
+
+    starts = new_offsets[:-1]
+    out[starts[insert] + idx[insert]] = connector[insert]
+    out[starts[append] + lengths[append]] = connector[append]
+    out[starts[append] + lengths[append] + 1] = new_word[append]
+    out[starts[prepend]] = new_word[prepend]
+    out[starts[prepend] + 1] = connector[prepend]
+    return out, new_offsets
+
+def breed_batch(store: PopulationStore, pairs: np.ndarray, pool_words: List[str], connectors: List[str],
+                rng: np.random.Generator, indpb: float = 0.2) -> PopulationStore:
+    """
+    Mates and mutates every parent pair (rows of store) in one pass.
+    Returns the children as a new store sharing store's vocabulary, with parents set to pairs.
+    """
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    vocab = store.vocab
+    void_id = vocab.intern("void")
+    pool_ids = vocab.intern_many(pool_words)
+    connector_ids = vocab.intern_many(connectors)
+
+    values, offsets = mate_batch(store.values, store.offsets, pairs, rng, void_id)
+    values, offsets = mutate_batch(values, offsets, pool_ids, connector_ids, rng, indpb)
+
+    children = PopulationStore(vocab)
+    children.append_tokens(values, np.diff(offsets), parents=pairs)
+    return children
@@ -0,0 +1,179 @@
+"""
+Generation manifest.
+
+data/manifest.json records what exists without scanning data/:
+
+    {"latest_generation": 13,
+     "generations": {"13": {"count": 50, "timestamp": "...",
+                            "artifacts": {"population": "g13/population.json", "wordcrowd": "g13/wordcrowd.html", ...}}},
+     "updated": "..."}
+
+Repository updates it (write to a temp file, then an atomic rename) whenever a
+generation or its artifacts are saved. The read-modify-write holds an exclusive
+lock on data/manifest.json.lock, so concurrent writers (a cron `app.py new` and
+the API's /api/evolve) do not drop each other's entries. Readers keep the parsed manifest in memory
+and re-read it only when its mtime changes, so the latest generation is an
+os.stat away. If the manifest does not exist yet, it is rebuilt in memory from a
+one-off scan of data/.
+"""
+import os
+import re
+import json
+import datetime
+import threading
+import contextlib
+from typing import Dict, Any, Optional, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+MANIFEST_FILENAME = "manifest.json"
+LOCK_FILENAME = "manifest.json.lock"
+
+# Population files by storage backend, in lookup order
+POPULATION_FILES = ("generation.bin", "population.json")
+ARTIFACT_FILES = {"keywords": "keywords.json", "situation": "situation.json", "wordcrowd": "wordcrowd.html"}
+
+_write_lock = threading.Lock()
+
+def manifest_path(data_dir: str) -> str:
+    return os.path.join(data_dir, MANIFEST_FILENAME)
+
+@contextlib.contextmanager
+def _locked(data_dir: str) -> Iterator[None]:
+    """Exclusive lock across threads (threading.Lock) and processes (fcntl/msvcrt lock file)."""
+    with _write_lock:
+        os.makedirs(data_dir, exist_ok=True)
+        with open(os.path.join(data_dir, LOCK_FILENAME), 'a+b') as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                # LK_LOCK retries for about 10 s; loop until the other writer is done
+                while True:
+                    try:
+                        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def empty_manifest() -> Dict[str, Any]:
+    return {"latest_generation": -1, "generations": {}, "updated": None}
+
+def scan_manifest(data_dir: str) -> Dict[str, Any]:
+    """Builds a manifest by scanning data/g*/ (used when no manifest has been written yet)."""
+    manifest = empty_manifest()
+    if not os.path.isdir(data_dir):
+        return manifest
+    for name in os.listdir(data_dir):
+        if not re.match(r'^g\d+$', name):
+            continue
+        g_dir = os.path.join(data_dir, name)
+        entry = {"count": None, "timestamp": None, "artifacts": {}}
+        for filename in POPULATION_FILES:
+            if os.path.exists(os.path.join(g_dir, filename)):
+                entry["artifacts"]["population"] = f"{name}/{filename}"
+                break
+        for key, filename in ARTIFACT_FILES.items():
+            if os.path.exists(os.path.join(g_dir, filename)):
+                entry["artifacts"][key] = f"{name}/{filename}"
+        try:
+            with open(os.path.join(g_dir, "metadata.json"), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            entry["count"] = meta.get("count")
+            entry["timestamp"] = meta.get("timestamp")
+        except (OSError, ValueError):
+            pass
+        manifest["generations"][name[1:]] = entry
+        manifest["latest_generation"] = max(manifest["latest_generation"], int(name[1:]))
+    return manifest
+
+def _read(data_dir: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(manifest_path(data_dir), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def update_manifest(data_dir: str, g: int, count: Optional[int] = None, timestamp: Optional[str] = None,
+                    artifacts: Optional[Dict[str, str]] = None):
+    """
+    Records generation g (count, timestamp, artifact paths relative to data_dir) and
+    bumps latest_generation. The file is replaced atomically.
+    """
+    with _locked(data_dir):
+        manifest = _read(data_dir) or scan_manifest(data_dir)
+        entry = manifest["generations"].setdefault(str(g), {"count": None, "timestamp": None, "artifacts": {}})
+        if count is not None:
+            entry["count"] = count
+        entry["timestamp"] = timestamp or entry.get("timestamp") or datetime.datetime.now().isoformat()
+        if artifacts:
+            entry["artifacts"].update(artifacts)
+        manifest["latest_generation"] = max(manifest["latest_generation"], g)
+        manifest["updated"] = datetime.datetime.now().isoformat()
+
+        tmp_path = manifest_path(data_dir) + f".{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, manifest_path(data_dir))
+
+class ManifestReader:
+    """Cached manifest, revalidated by mtime (of the manifest, or of data/ while there is none)."""
+
+    def __init__(self, data_dir: str):
+        self.data_dir = data_dir
+        self._stamp = None
+        self._manifest = empty_manifest()
+
+    def load(self) -> Dict[str, Any]:
+        try:
+            st = os.stat(manifest_path(self.data_dir))
+            stamp = ("manifest", st.st_mtime_ns, st.st_size, st.st_ino)
+        except OSError:
+            try:
+                stamp = ("scan", os.stat(self.data_dir).st_mtime_ns)
+            except OSError:
+                return empty_manifest()
+
+        if stamp != self._stamp:
+            manifest = _read(self.data_dir) if stamp[0] == "manifest" else None
+            self._manifest = manifest if manifest is not None else scan_manifest(self.data_dir)
+            self._stamp = stamp
+        return self._manifest
+
+    def latest_generation(self) -> int:
+        return self.load()["latest_generation"]
+
+    def generation(self, g: int) -> Optional[Dict[str, Any]]:
+        return self.load()["generations"].get(str(g))
+
+    def artifact_path(self, g: int, artifact: str) -> Optional[str]:
+        """Absolute path of an artifact (population, keywords, situation, wordcrowd) of generation g, if recorded."""
+        entry = self.generation(g)
+        if entry is None or artifact not in entry["artifacts"]:
+            return None
+        return os.path.join(self.data_dir, entry["artifacts"][artifact])
+
+_readers: Dict[str, ManifestReader] = {}
+
+def manifest_reader(data_dir: str) -> ManifestReader:
+    """Process-wide reader for data_dir."""
+    key = os.path.abspath(data_dir)
+    if key not in _readers:
+        _readers[key] = ManifestReader(key)
+    return _readers[key]
+
+def get_latest_generation(data_dir: str) -> int:
+    """Latest saved generation in data_dir, or -1 if there is none."""
+    return manifest_reader(data_dir).latest_generation()
@@ -0,0 +1,108 @@
+"""
+Content-keyed vector and novelty memo.
+
+Survivors and repeated offspring come back every generation with the same
+content. The memo keeps their vectors across generations, and their novelty for
+as long as the reference set (population contents plus archive size) is unchanged.
+"""
+import hashlib
+from collections import OrderedDict
+from typing import List, Dict, Iterable, Callable, Optional
+
+import numpy as np
+
+def content_key(words: Iterable[str]) -> str:
+    """
+    Normalized content: tokens joined by single spaces.
+    Order and repeats are kept because they change the vector ("Neon LDR LDR" != "LDR Neon").
+    """
+    return " ".join(" ".join(words).split())
+
+class FitnessMemo:
+    """
+    Bounded LRU memo: content key -> vector, plus novelty tagged with the reference it was scored against.
+
+    Args:
+        capacity: Maximum number of contents kept; the least recently used are evicted.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self.vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.novelty: Dict[str, float] = {}
+        self.reference: Optional[str] = None
+        self.reset_stats()
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def reset_stats(self):
+        self.stats = {"vector_hits": 0, "vector_misses": 0, "novelty_hits": 0, "novelty_misses": 0, "duplicates": 0}
+
+    @staticmethod
+    def reference_key(keys: Iterable[str], archive_size: int = 0) -> str:
+        """Fingerprint of a reference set: its distinct contents and the archive size."""
+        digest = hashlib.blake2b(digest_size=16)
+        for key in sorted(set(keys)):
+            digest.update(key.encode('utf-8'))
+            digest.update(b'\0')
+        digest.update(str(archive_size).encode('ascii'))
+        return digest.hexdigest()
+
+    def get_vectors(self, keys: List[str], embed: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """
+        Returns an (N, dim) matrix for keys. Missing distinct keys are embedded in one
+        embed(list_of_keys) call and remembered.
+        """
+        missing = list(dict.fromkeys(k for k in keys if k not in self.vectors))
+        self.stats["vector_hits"] += len(keys) - len(missing)
+        self.stats["vector_misses"] += len(missing)
+
+        fresh = dict(zip(missing, embed(missing))) if missing else {}
+        rows = []
+        for key in keys:
+            vector = fresh.get(key)
+            if vector is None:
+                vector = self.vectors[key]
+                self.vectors.move_to_end(key)
+            rows.append(vector)
+
+        for key, vector in fresh.items():
+            self.vectors[key] = vector
+        self._evict()
+        return np.array(rows, dtype=np.float32).reshape(len(keys), -1)
+
+    def put_vectors(self, keys: List[str], vectors: np.ndarray):
+        """Seeds vectors computed elsewhere (e.g. stored with a generation)."""
+        for key, vector in zip(keys, vectors):
+            self.vectors[key] = vector
+        self._evict()
+
+    def get_novelty(self, keys: List[str], reference: str) -> Optional[np.ndarray]:
+        """Novelty for keys if every one was scored against this reference, else None."""
+        if reference != self.reference:
+            # The reference set changed: earlier scores are stale
+            self.novelty = {}
+            self.reference = reference
+        if all(k in self.novelty for k in keys):
+            self.stats["novelty_hits"] += len(keys)
+            return np.array([self.novelty[k] for k in keys])
+        self.stats["novelty_misses"] += len(keys)
+        return None
+
+    def put_novelty(self, keys: List[str], values: np.ndarray, reference: str):
+        if reference != self.reference:
+            self.novelty = {}
+            self.reference = reference
+        self.novelty.update(zip(keys, (float(v) for v in values)))
+
+    def _evict(self):
+        while len(self.vectors) > self.capacity:
+            key, _ = self.vectors.popitem(last=False)
+            self.novelty.pop(key, None)
+
+    def report(self) -> str:
+        s = self.stats
+        return (f"vectors {s['vector_hits']} hit / {s['vector_misses']} miss, "
+                f"novelty {s['novelty_hits']} hit / {s['novelty_misses']} miss, "
+                f"{s['duplicates']} duplicates, {len(self)} cached")
@@ -0,0 +1,138 @@
+"""
+Incremental nearest-neighbour novelty.
+
+Keeps every row's best cosine similarity to any other row. Adding D rows costs
+O(D·N); removing rows costs O(R·N), where R is the number of rows whose nearest
+neighbour was among the removed ones (only those are rescanned).
+"""
+from typing import List, Dict, Any
+
+import numpy as np
+
+from src.nlp.vectorizer import Vectorizer
+
+class IncrementalNeighbors:
+    """
+    Rows are addressed by key (e.g. normalized content). Slots of removed rows are reused.
+
+    Args:
+        capacity: Initial number of slots; grows by doubling.
+        block_size: Rows per similarity block, bounding temporary memory to block_size x N.
+    """
+
+    def __init__(self, capacity: int = 1024, block_size: int = 1024):
+        self.capacity = capacity
+        self.block_size = block_size
+        self.vectors = None
+        self.active = np.zeros(0, dtype=bool)
+        self.nearest = np.zeros(0, dtype=np.float32)
+        self.nearest_row = np.zeros(0, dtype=np.int64)
+        self.rows: Dict[str, int] = {}
+        self.free: List[int] = []
+        self.stats = {"added": 0, "removed": 0, "rescanned": 0}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.rows
+
+    def _allocate(self, n: int, dim: int) -> np.ndarray:
+        if self.vectors is None:
+            size = max(self.capacity, n)
+            self.vectors = np.zeros((size, dim), dtype=np.float32)
+            self.active = np.zeros(size, dtype=bool)
+            self.nearest = np.full(size, -np.inf, dtype=np.float32)
+            self.nearest_row = np.full(size, -1, dtype=np.int64)
+            self.free = list(range(size - 1, -1, -1))
+
+        if len(self.free) < n:
+            old = len(self.active)
+            size = max(2 * old, old + n - len(self.free))
+            self.vectors = np.concatenate([self.vectors, np.zeros((size - old, dim), dtype=np.float32)])
+            self.active = np.concatenate([self.active, np.zeros(size - old, dtype=bool)])
+            self.nearest = np.concatenate([self.nearest, np.full(size - old, -np.inf, dtype=np.float32)])
+            self.nearest_row = np.concatenate([self.nearest_row, np.full(size - old, -1, dtype=np.int64)])
+            self.free = list(range(size - 1, old - 1, -1)) + self.free
+
+        return np.array([self.free.pop() for _ in range(n)], dtype=np.int64)
+
+    def _scan(self, rows: np.ndarray, update_others: bool):
+        """
+        Sets nearest for rows from a scan over every active row (self excluded).
+        With update_others, active rows that have one of rows as a new nearest are updated too.
+        """
+        columns = np.flatnonzero(self.active)
+        matrix = self.vectors[columns]
+        for start in range(0, len(rows), self.block_size):
+            block = rows[start:start + self.block_size]
+            sims = self.vectors[block] @ matrix.T
+            sims[np.arange(len(block)), np.searchsorted(columns, block)] = -np.inf
+
+            best = sims.argmax(axis=1)
+            self.nearest[block] = sims[np.arange(len(block)), best]
+            self.nearest_row[block] = columns[best]
+
+            if update_others:
+                col_best = sims.argmax(axis=0)
+                col_sims = sims[col_best, np.arange(len(columns))]
+                better = col_sims > self.nearest[columns]
+                self.nearest[columns[better]] = col_sims[better]
+                self.nearest_row[columns[better]] = block[col_best[better]]
+
+    def add(self, keys: List[str], vectors: Any):
+        """Adds rows for keys that are not present yet (vectors aligned with keys)."""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(keys), -1)
+        fresh = []
+        seen = set()
+        for i, key in enumerate(keys):
+            if key not in self.rows and key not in seen:
+                seen.add(key)
+                fresh.append(i)
+        if not fresh:
+            return
+        rows = self._allocate(len(fresh), vectors.shape[1])
+        self.vectors[rows] = Vectorizer.normalize(vectors[fresh])
+        self.active[rows] = True
+        for i, row in zip(fresh, rows):
+            self.rows[keys[i]] = int(row)
+        self.stats["added"] += len(rows)
+
+        self._scan(rows, update_others=True)
+
+    def remove(self, keys: List[str]):
+        """Removes rows and rescans only the rows whose nearest neighbour was removed."""
+        rows = np.array([self.rows.pop(key) for key in keys if key in self.rows], dtype=np.int64)
+        if len(rows) == 0:
+            return
+        self.active[rows] = False
+        self.nearest[rows] = -np.inf
+        self.nearest_row[rows] = -1
+        self.free.extend(rows.tolist())
+        self.stats["removed"] += len(rows)
+
+        stale = np.flatnonzero(self.active & np.isin(self.nearest_row, rows))
+        self.stats["rescanned"] += len(stale)
+        if len(stale):
+            self._scan(stale, update_others=False)
+
+    def sync(self, keys: List[str], vectors: Any) -> np.ndarray:
+        """
+        Makes the structure hold exactly keys (removing the others, adding the new ones)
+        and returns their novelty.
+        """
+        wanted = set(keys)
+        self.remove([key for key in self.rows if key not in wanted])
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(keys), -1)
+        new = [i for i, key in enumerate(keys) if key not in self.rows]
+        if new:
+            self.add([keys[i] for i in new], vectors[new])
+        return self.novelty(keys)
+
+    def novelty(self, keys: List[str]) -> np.ndarray:
+        """1.0 minus the nearest similarity (clipped to [0, 1]); 1.0 for a row with no neighbour."""
+        if not keys:
+            return np.zeros(0)
+        nearest = self.nearest[[self.rows[key] for key in keys]].astype(np.float64)
+        # float32 dot products of near-identical rows can exceed 1.0
+        return 1.0 - np.clip(nearest, 0.0, 1.0)
@@ -1,17 +1,22 @@
 import random
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Optional
+import numpy as np
 from deap import base, creator, tools
 
 from src.nlp.evaluator import Evaluator
+from src.nlp.ann import LSHIndex
+from src.nlp.vectorizer import Vectorizer
 from src.fitness.score import FitnessScore
 
 # Initialize Evaluator and FitnessScore globally or pass them in
 # For DEAP operators, it's often easier to use closures or global/singleton access if state is needed
 # Here we'll assume they are initialized in the main engine and passed or used via wrapper functions
 
-def evaluate_novelty(individual: List[str], population_vectors: Dict[str, Any], evaluator: Evaluator) -> Tuple[float]:
+def evaluate_novelty(individual: List[str], population_vectors: Dict[str, Any], evaluator: Evaluator, index: Optional[LSHIndex] = None, k: int = 1) -> Tuple[float]:
     """
     Calculate novelty score for an individual.
+    If an LSHIndex is given, novelty is 1.0 minus the mean similarity of the
+    (up to k) nearest indexed vectors it finds instead of an exhaustive population scan.
     Returns a tuple (score,) as DEAP expects.
     """
     # Create a dummy ID for the individual to use existing evaluator logic if needed,
@@ -26,6 +31,14 @@ def evaluate_novelty(individual: List[str], population_vectors: Dict[str, Any],
     # Get vector for this individual
     text = " ".join(individual)
     vector = evaluator.vectorize(text)
+
+    if index is not None and len(index) > 0:
+        indices, sims = index.query([vector], k=k)
+        # Buckets can hold fewer than k candidates; missing neighbours do not count as dissimilar
+        found = sims[0][indices[0] >= 0]
+        if len(found) == 0:
+            return (1.0,)
+        return (float(1.0 - np.clip(found, 0.0, 1.0).mean()),)
     
     # Calculate similarity to others in the provided map
     if not population_vectors:
@@ -46,6 +59,63 @@ def evaluate_novelty(individual: List[str], population_vectors: Dict[str, Any],
     novelty = 1.0 - max_sim
     return (novelty,)
 
+def evaluate_population(population: List[List[str]], vectors: Any, reference: Any = None, archive: Any = None, pool: Any = None,
+                        index: Optional[LSHIndex] = None) -> np.ndarray:
+    """
+    Calculate novelty for a whole population at once and write it to each individual's fitness.
+    vectors is an (N, dim) matrix aligned with population.
+
+    Without reference, every individual is compared to the rest of the population (its own
+    row excluded). With a reference matrix, rows are compared to all reference rows instead.
+    With a NoveltyArchive, the lower of the population and archive novelty is kept.
+    With a ProcessPool, the all-pairs scan is split into row blocks across its workers.
+    With an empty LSHIndex, the population is added to it and each row's nearest other row
+    is looked up approximately instead of the all-pairs scan.
+    Returns the novelty array.
+    """
+    if len(population) == 0:
+        return np.zeros(0)
+
+    queries = Vectorizer.normalize(vectors)
+    if reference is None:
+        if len(population) == 1:
+            novelty = np.ones(1)
+        elif index is not None:
+            novelty = _novelty_from_max(ann_max_similarity(queries, index))
+        elif pool is not None:
+            novelty = _novelty_from_max(pool.max_similarity(queries))
+        else:
+            sims = queries @ queries.T
+            np.fill_diagonal(sims, -np.inf)
+            novelty = _novelty_from_max(sims.max(axis=1))
+    elif len(reference) == 0:
+        novelty = np.ones(len(population))
+    else:
+        sims = queries @ Vectorizer.normalize(reference).T
+        novelty = _novelty_from_max(sims.max(axis=1))
+
+    if archive is not None and len(archive) > 0:
+        novelty = np.minimum(novelty, archive.score(vectors))
+
+    for ind, value in zip(population, novelty):
+        ind.fitness.values = (float(value),)
+    return novelty
+
+def ann_max_similarity(vectors: np.ndarray, index: LSHIndex) -> np.ndarray:
+    """
+    Approximate per-row maximum similarity to the other rows of vectors (own row excluded),
+    using an empty LSHIndex. Rows whose buckets hold no other row get -inf (novelty 1.0).
+    """
+    rows = index.add(vectors)
+    indices, sims = index.query(vectors, k=2)
+    others = (indices >= 0) & (indices != rows[:, None])
+    return np.where(others, sims, -np.inf).max(axis=1)
+
+def _novelty_from_max(max_sim: np.ndarray) -> np.ndarray:
+    # Same as evaluate_novelty: Novelty = 1.0 - Max Similarity, with similarity clipped to [0, 1]
+    # (float32 dot products of near-identical rows can exceed 1.0 and show as novelty -0.000)
+    return 1.0 - np.clip(max_sim.astype(np.float64), 0.0, 1.0)
+
 def mate_combine(ind1: List[str], ind2: List[str]) -> Tuple[List[str], List[str]]:
     """
     Crossover: Combine words from two parents.
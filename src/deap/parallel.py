@@ -0,0 +1,113 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Tuple, Any, Optional, Callable, Iterable
+
+import numpy as np
+
+class SharedMatrix:
+    """
+    A NumPy matrix placed in multiprocessing.shared_memory.
+    Workers attach by name through spec instead of receiving a pickled copy.
+    """
+
+    def __init__(self, array: np.ndarray):
+        array = np.ascontiguousarray(array)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+        self.array = np.ndarray(array.shape, dtype=array.dtype, buffer=self._shm.buf)
+        self.array[...] = array
+        self.spec = (self._shm.name, array.shape, array.dtype.str)
+
+    def close(self):
+        if self._shm is not None:
+            self.array = None
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Worker-side attachment, reused across tasks for the same matrix
+_attached = None
+
+def attach(spec: Tuple[str, tuple, str]) -> np.ndarray:
+    """Returns the shared matrix described by spec (called in worker processes)."""
+    global _attached
+    name, shape, dtype = spec
+    if _attached is None or _attached[0] != name:
+        if _attached is not None:
+            _attached[1].close()
+        # track=False keeps the worker's resource tracker from unlinking memory it does not own (3.13+)
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            shm = shared_memory.SharedMemory(name=name)
+        _attached = (name, shm, np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf))
+    return _attached[2]
+
+def max_similarity_block(task: Tuple[Tuple[str, tuple, str], int, int]) -> np.ndarray:
+    """
+    Worker task: maximum cosine similarity of rows [start, stop) of a shared,
+    row-normalized matrix to every other row (own row excluded).
+    """
+    spec, start, stop = task
+    normed = attach(spec)
+    sims = normed[start:stop] @ normed.T
+    rows = np.arange(stop - start)
+    sims[rows, rows + start] = -np.inf
+    return sims.max(axis=1)
+
+def breed_block(task: Tuple[List[Tuple[List[str], List[str]]], List[str], int]) -> List[List[str]]:
+    """
+    Worker task: mate and mutate a block of parent pairs (as word lists).
+    Returns one child word list per pair, like the serial breeding loop.
+    """
+    from src.deap.operators import mate_combine
+    from src.deap.mutation import mutate_sentence
+
+    pairs, all_words_pool, seed = task
+    random.seed(seed)
+    children = []
+    for words1, words2 in pairs:
+        child1, child2 = list(words1), list(words2)
+        mate_combine(child1, child2)
+        mutate_sentence(child1, all_words_pool=all_words_pool)
+        children.append(child1)
+    return children
+
+class ProcessPool:
+    """
+    Process pool used as toolbox.map.
+    workers defaults to the CPU count; block_size is the row block per evaluation task.
+    """
+
+    def __init__(self, workers: Optional[int] = None, block_size: int = 1024):
+        self.workers = workers or os.cpu_count() or 1
+        self.block_size = block_size
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def map(self, func: Callable, iterable: Iterable[Any]) -> List[Any]:
+        return list(self._executor.map(func, iterable))
+
+    def max_similarity(self, normed: np.ndarray) -> np.ndarray:
+        """Per-row maximum similarity (own row excluded), computed by the workers over shared memory."""
+        n = len(normed)
+        with SharedMatrix(normed) as shared:
+            tasks = [(shared.spec, start, min(start + self.block_size, n)) for start in range(0, n, self.block_size)]
+            return np.concatenate(self.map(max_similarity_block, tasks))
+
+    def breed(self, pairs: List[Tuple[List[str], List[str]]], all_words_pool: List[str]) -> List[List[str]]:
+        """Mate and mutate parent pairs across the workers."""
+        if not pairs:
+            return []
+        chunk = max(1, -(-len(pairs) // self.workers))
+        tasks = [(pairs[i:i + chunk], all_words_pool, random.getrandbits(32)) for i in range(0, len(pairs), chunk)]
+        return [child for block in self.map(breed_block, tasks) for child in block]
+
+    def close(self):
+        self._executor.shutdown()
@@ -0,0 +1,218 @@
+import os
+import uuid
+from typing import List, Dict, Any, Optional, Iterable, Callable, Sequence, Tuple
+
+import numpy as np
+
+NO_PARENT = -1
+
+def random_uuids(n: int) -> np.ndarray:
+    """Returns n random (version 4) UUIDs as an (n, 16) uint8 array."""
+    raw = np.frombuffer(os.urandom(16 * n), dtype=np.uint8).reshape(n, 16).copy()
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    return raw
+
+class Vocabulary:
+    """Global token interning table: token <-> int32 id."""
+
+    def __init__(self, tokens: Iterable[str] = ()):
+        self.tokens: List[str] = []
+        self.ids: Dict[str, int] = {}
+        for token in tokens:
+            self.intern(token)
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def intern(self, token: str) -> int:
+        token_id = self.ids.get(token)
+        if token_id is None:
+            token_id = len(self.tokens)
+            self.ids[token] = token_id
+            self.tokens.append(token)
+        return token_id
+
+    def intern_many(self, tokens: Iterable[str]) -> np.ndarray:
+        return np.array([self.intern(t) for t in tokens], dtype=np.int32)
+
+    def lookup(self, token_ids: Iterable[int]) -> List[str]:
+        return [self.tokens[i] for i in token_ids]
+
+class PopulationStore:
+    """
+    Compact, array-backed population.
+
+    Individual i's tokens are values[offsets[i]:offsets[i + 1]] (int32 ids into vocab).
+    Parallel arrays hold fitness (novelty), UUIDs as 16 raw bytes, parent indices
+    (two per individual, NO_PARENT if unknown; rows of the parent store while breeding)
+    and parent ids for lineage (two UUIDs per individual, all zero if absent).
+    Ids that are not UUIDs are kept in small side tables so records round-trip unchanged.
+    """
+
+    def __init__(self, vocab: Optional[Vocabulary] = None):
+        self.vocab = vocab if vocab is not None else Vocabulary()
+        self.values = np.zeros(0, dtype=np.int32)
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.fitness = np.zeros(0, dtype=np.float64)
+        self.uuids = np.zeros((0, 16), dtype=np.uint8)
+        self.parents = np.zeros((0, 2), dtype=np.int32)
+        self.parent_uuids = np.zeros((0, 2, 16), dtype=np.uint8)
+        self.raw_ids: Dict[int, str] = {}
+        self.raw_parent_ids: Dict[Tuple[int, int], str] = {}
+
+    def __len__(self) -> int:
+        return len(self.fitness)
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the arrays (vocabulary excluded)."""
+        return (self.values.nbytes + self.offsets.nbytes + self.fitness.nbytes + self.uuids.nbytes + self.parents.nbytes
+                + self.parent_uuids.nbytes)
+
+    def token_ids(self, i: int) -> np.ndarray:
+        return self.values[self.offsets[i]:self.offsets[i + 1]]
+
+    def words(self, i: int) -> List[str]:
+        return self.vocab.lookup(self.token_ids(i))
+
+    def content(self, i: int) -> str:
+        return " ".join(self.words(i))
+
+    def id(self, i: int) -> str:
+        if i in self.raw_ids:
+            return self.raw_ids[i]
+        return str(uuid.UUID(bytes=self.uuids[i].tobytes()))
+
+    def ids(self) -> List[str]:
+        return [self.id(i) for i in range(len(self))]
+
+    def parent_ids(self, i: int) -> List[str]:
+        """Ids of individual i's parents (empty for loaded or injected individuals)."""
+        ids = []
+        for slot in range(2):
+            if (i, slot) in self.raw_parent_ids:
+                ids.append(self.raw_parent_ids[(i, slot)])
+            elif self.parent_uuids[i, slot].any():
+                ids.append(str(uuid.UUID(bytes=self.parent_uuids[i, slot].tobytes())))
+        return ids
+
+    def append(self, word_lists: List[List[str]], ids: Optional[List[str]] = None,
+               fitness: Optional[Iterable[float]] = None, parents: Optional[np.ndarray] = None,
+               parent_ids: Optional[List[Sequence[str]]] = None) -> np.ndarray:
+        """Appends individuals given as word lists. New UUIDs are generated when ids is None. Returns their rows."""
+        values = [self.vocab.intern_many(words) for words in word_lists]
+        lengths = np.array([len(v) for v in values], dtype=np.int64)
+        flat = np.concatenate(values) if values else np.zeros(0, dtype=np.int32)
+        return self.append_tokens(flat, lengths, ids=ids, fitness=fitness, parents=parents, parent_ids=parent_ids)
+
+    def append_tokens(self, values: np.ndarray, lengths: np.ndarray, ids: Optional[List[str]] = None,
+                      fitness: Optional[Iterable[float]] = None, parents: Optional[np.ndarray] = None,
+                      parent_ids: Optional[List[Sequence[str]]] = None) -> np.ndarray:
+        """
+        Appends individuals already in token-id form (flat values plus per-individual lengths).
+        parent_ids holds up to two parent ids per individual (lineage across generations).
+        """
+        n = len(lengths)
+        start = len(self)
+        rows = np.arange(start, start + n)
+
+        self.values = np.concatenate([self.values, np.asarray(values, dtype=np.int32)])
+        self.offsets = np.concatenate([self.offsets, self.offsets[-1] + np.cumsum(lengths, dtype=np.int64)])
+        self.fitness = np.concatenate([self.fitness, np.zeros(n) if fitness is None else np.asarray(list(fitness), dtype=np.float64)])
+        new_parents = np.full((n, 2), NO_PARENT, dtype=np.int32) if parents is None else np.asarray(parents, dtype=np.int32).reshape(n, 2)
+        self.parents = np.concatenate([self.parents, new_parents])
+
+        if ids is None:
+            uuids = random_uuids(n)
+        else:
+            uuids = np.zeros((n, 16), dtype=np.uint8)
+            for k in range(n):
+                try:
+                    uuids[k] = np.frombuffer(uuid.UUID(ids[k]).bytes, dtype=np.uint8)
+                except ValueError:
+                    self.raw_ids[start + k] = ids[k]
+        self.uuids = np.concatenate([self.uuids, uuids])
+
+        parent_uuids = np.zeros((n, 2, 16), dtype=np.uint8)
+        if parent_ids is not None:
+            for k in range(n):
+                for slot, parent in enumerate(list(parent_ids[k])[:2]):
+                    try:
+                        parent_uuids[k, slot] = np.frombuffer(uuid.UUID(parent).bytes, dtype=np.uint8)
+                    except ValueError:
+                        self.raw_parent_ids[(start + k, slot)] = parent
+        self.parent_uuids = np.concatenate([self.parent_uuids, parent_uuids])
+        return rows
+
+    def take(self, rows: Iterable[int]) -> "PopulationStore":
+        """Returns a new store (sharing the vocabulary) with the given rows in order; parents are kept as-is."""
+        rows = np.asarray(list(rows), dtype=np.int64)
+        lengths = self.lengths[rows]
+        starts = self.offsets[rows]
+        # Gather ragged token slices without a Python loop
+        gather = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths) + np.arange(lengths.sum())
+
+        store = PopulationStore(self.vocab)
+        store.values = self.values[gather]
+        store.offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        store.fitness = self.fitness[rows]
+        store.uuids = self.uuids[rows]
+        store.parents = self.parents[rows]
+        store.parent_uuids = self.parent_uuids[rows]
+        store.raw_ids = {k: self.raw_ids[r] for k, r in enumerate(rows.tolist()) if r in self.raw_ids}
+        store.raw_parent_ids = {(k, slot): self.raw_parent_ids[(r, slot)]
+                                for k, r in enumerate(rows.tolist()) for slot in range(2) if (r, slot) in self.raw_parent_ids}
+        return store
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]], vocab: Optional[Vocabulary] = None) -> "PopulationStore":
+        """Builds a store from population.json records ({"id", "content", "fitness": {"novelty"}, "parents"})."""
+        store = cls(vocab)
+        store.append(
+            [item['content'].split() for item in records],
+            ids=[item['id'] for item in records],
+            fitness=[item.get('fitness', {}).get('novelty', 0.0) for item in records],
+            parent_ids=[item.get('parents', ()) for item in records]
+        )
+        return store
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Exports population.json records in the existing schema."""
+        return [
+            {
+                "id": self.id(i),
+                "content": self.content(i),
+                "fitness": {"novelty": float(self.fitness[i])},
+                "tags": [],
+                "parents": self.parent_ids(i)
+            }
+            for i in range(len(self))
+        ]
+
+    @classmethod
+    def from_individuals(cls, population: List[Any], vocab: Optional[Vocabulary] = None) -> "PopulationStore":
+        """Builds a store from DEAP individuals (word lists with id and fitness)."""
+        store = cls(vocab)
+        store.append(
+            [list(ind) for ind in population],
+            ids=[ind.id for ind in population],
+            fitness=[ind.fitness.values[0] if ind.fitness.valid else 0.0 for ind in population],
+            parent_ids=[getattr(ind, "parents", ()) for ind in population]
+        )
+        return store
+
+    def to_individuals(self, factory: Callable[[List[str]], Any]) -> List[Any]:
+        """Builds DEAP individuals with factory (e.g. creator.Individual)."""
+        population = []
+        for i in range(len(self)):
+            ind = factory(self.words(i))
+            ind.id = self.id(i)
+            ind.content = " ".join(ind)
+            ind.parents = tuple(self.parent_ids(i))
+            population.append(ind)
+        return population
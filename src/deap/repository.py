@@ -1,15 +1,58 @@
 import os
+import glob
 import json
 import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+from src.deap.population_store import PopulationStore, Vocabulary
+from src.deap.generation_file import GenerationFile, write_generation, FILENAME as GENERATION_FILE
+from src.deap.manifest import update_manifest, ARTIFACT_FILES
+from src.deap.generation_writer import GenerationWriter
+
+# "json" (population.json + metadata.json), "binary" (one generation.bin per generation)
+# or "sqlite" (data/mindmutant.db, see src.deap.sqlite_repository)
+STORAGE_BACKENDS = ("json", "binary", "sqlite")
+DEFAULT_STORAGE = os.environ.get("MINDMUTANT_STORAGE", "json")
 
 DATA_DIR = os.path.join(os.getcwd(), 'data')
 G0_DIR = os.path.join(DATA_DIR, 'g0')
 
+def open_repository(island: Optional[int] = None, backend: Optional[str] = None) -> "Repository":
+    """Repository for a storage backend (defaults to MINDMUTANT_STORAGE, else json)."""
+    backend = backend or DEFAULT_STORAGE
+    if backend == "sqlite":
+        from src.deap.sqlite_repository import SQLiteRepository
+        return SQLiteRepository(island=island)
+    return Repository(island=island, backend=backend)
+
 class Repository:
-    def __init__(self):
+    def __init__(self, island: Optional[int] = None, backend: Optional[str] = None):
         self.data_dir = DATA_DIR
         self.g0_dir = G0_DIR
+        # Island mode keeps per-island state under data/g{n}/island{k}/
+        self.island = island
+        # Processed addwords files waiting to be archived with the next saved generation
+        self.pending_archives: List[str] = []
+        self.backend = backend or DEFAULT_STORAGE
+        if self.backend not in STORAGE_BACKENDS:
+            raise ValueError(f"Unknown storage backend '{self.backend}'. Choose from {STORAGE_BACKENDS}.")
+
+    def close(self):
+        pass
+
+    def record_manifest(self, g: int, count: Optional[int] = None, timestamp: Optional[str] = None,
+                        artifacts: Optional[Dict[str, str]] = None):
+        """Updates data/manifest.json for the main population (islands are not listed)."""
+        if self.island is not None:
+            return
+        relative = {key: os.path.relpath(path, self.data_dir).replace(os.sep, "/") for key, path in (artifacts or {}).items()}
+        update_manifest(self.data_dir, g, count=count, timestamp=timestamp, artifacts=relative)
+
+    def generation_dir(self, g: int) -> str:
+        g_dir = os.path.join(self.data_dir, f"g{g}")
+        if self.island is not None:
+            g_dir = os.path.join(g_dir, f"island{self.island}")
+        return g_dir
 
     def load_source_data(self) -> List[str]:
         """
@@ -35,37 +78,66 @@ class Repository:
     def load_and_archive_injected_words(self, target_g: int) -> List[str]:
         """
         Loads new words from poll/addwords.csv if it exists.
-        Moves the file to data/g{target_g}/addwords_{timestamp}.csv after loading.
+        The file is moved aside right away (data/.addwords_{timestamp}.csv) and archived as
+        addwords_{timestamp}.csv in the next saved generation (archive_injections), so
+        data/g{target_g}/ is not created ahead of its save. Files left aside by a run that
+        stopped before saving are injected again.
+        In island mode only island 0 takes the words; migration spreads them.
         """
+        if self.island:
+            return []
+
+        words = []
+        # Left over by a crash or a stream that stopped before its next checkpoint
+        for pending_path in sorted(glob.glob(os.path.join(self.data_dir, '.addwords_*.csv'))):
+            if pending_path not in self.pending_archives:
+                recovered = self._read_injected_words(pending_path)
+                words.extend(recovered)
+                self.pending_archives.append(pending_path)
+                print(f"Re-injected {len(recovered)} words from {os.path.basename(pending_path)}.")
+
         csv_path = os.path.join(self.data_dir, 'addwords.csv')
         if not os.path.exists(csv_path):
-            return []
+            return words
             
-        words = []
         try:
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                # Split by newline or comma
-                raw_words = content.replace(',', '\n').split('\n')
-                words = [w.strip() for w in raw_words if w.strip()]
+            injected = self._read_injected_words(csv_path)
                 
-            # Move processed file to target generation directory
-            g_dir = os.path.join(self.data_dir, f"g{target_g}")
-            os.makedirs(g_dir, exist_ok=True)
-            
+            # Move processed file aside until the generation is saved
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             new_filename = f"addwords_{timestamp}.csv"
-            new_path = os.path.join(g_dir, new_filename)
+            pending_path = os.path.join(self.data_dir, f".{new_filename}")
             
-            os.rename(csv_path, new_path)
-            print(f"Injected {len(words)} words. Moved file to {new_path}")
+            os.rename(csv_path, pending_path)
+            self.pending_archives.append(pending_path)
+            words.extend(injected)
+            print(f"Injected {len(injected)} words. Archiving file with g{target_g}.")
         except Exception as e:
             print(f"Error loading addwords.csv: {e}")
             
         return words
 
+    @staticmethod
+    def _read_injected_words(path: str) -> List[str]:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        # Split by newline or comma
+        raw_words = content.replace(',', '\n').split('\n')
+        return [w.strip() for w in raw_words if w.strip()]
+
+    def generation_file(self, g: int) -> Optional[GenerationFile]:
+        """Reader for data/g{g}/generation.bin, or None if the generation is stored as JSON."""
+        filepath = os.path.join(self.generation_dir(g), GENERATION_FILE)
+        if not os.path.exists(filepath):
+            return None
+        return GenerationFile(filepath)
+
     def load_generation(self, g: int) -> List[Dict[str, Any]]:
-        filepath = os.path.join(self.data_dir, f"g{g}", "population.json")
+        reader = self.generation_file(g)
+        if reader is not None:
+            return reader.records()
+
+        filepath = os.path.join(self.generation_dir(g), "population.json")
         if not os.path.exists(filepath):
             return []
         try:
@@ -75,35 +147,101 @@ class Repository:
             print(f"Error loading generation {g}: {e}")
             return []
 
+    def load_generation_store(self, g: int, vocab: Optional[Vocabulary] = None) -> PopulationStore:
+        """Loads generation g into a compact PopulationStore (straight from generation.bin when present)."""
+        reader = self.generation_file(g)
+        if reader is not None:
+            return reader.store(vocab)
+        return PopulationStore.from_records(self.load_generation(g), vocab)
+
     def ensure_generation_dir(self, g: int) -> str:
-        g_dir = os.path.join(self.data_dir, f"g{g}")
+        g_dir = self.generation_dir(g)
         os.makedirs(g_dir, exist_ok=True)
         return g_dir
 
-    def save_population(self, g: int, population: List[Dict[str, Any]]):
-        g_dir = self.ensure_generation_dir(g)
-        filepath = os.path.join(g_dir, "population.json")
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(population, f, indent=2, ensure_ascii=False)
+    def transaction(self, g: int, fsync: bool = True) -> GenerationWriter:
+        """
+        Writer that stages files for data/g{g}/ and publishes them together on commit.
+        Pass it as txn to the save_* methods; manifest updates are deferred until the commit.
+        """
+        return GenerationWriter(self.generation_dir(g), fsync=fsync, staging_root=self.data_dir)
+
+    def archive_injections(self, txn: GenerationWriter):
+        """Moves processed addwords files into a generation's transaction."""
+        for path in self.pending_archives:
+            if os.path.exists(path):
+                txn.adopt(path, os.path.basename(path).lstrip("."))
+        self.pending_archives = []
+
+    def _write_json(self, g: int, name: str, data: Any, txn: Optional[GenerationWriter],
+                    indent: Optional[int] = 2, fsync: bool = False) -> str:
+        """Writes name through txn, or in its own single-file transaction. Returns the published path."""
+        if txn is not None:
+            txn.write_json(name, data, indent=indent)
+        else:
+            with self.transaction(g, fsync=fsync) as own:
+                own.write_json(name, data, indent=indent)
+        return os.path.join(self.generation_dir(g), name)
 
-    def save_metadata(self, g: int, count: int):
-        g_dir = self.ensure_generation_dir(g)
+    def _after_commit(self, txn: Optional[GenerationWriter], callback):
+        if txn is None:
+            callback()
+        else:
+            txn.after_commit.append(callback)
+
+    def save_population(self, g: int, population: List[Dict[str, Any]], txn: Optional[GenerationWriter] = None):
+        # Durable before evolve returns; artifacts may still be rendering
+        self._write_json(g, "population.json", population, txn, fsync=True)
+
+    def save_generation_file(self, g: int, store: PopulationStore, vectors: Optional[Any] = None,
+                             meta: Optional[Dict[str, Any]] = None, txn: Optional[GenerationWriter] = None) -> str:
+        """Writes the whole generation (ids, tokens, fitness, parents, vectors) to data/g{g}/generation.bin."""
+        filepath = os.path.join(self.generation_dir(g), GENERATION_FILE)
+        if txn is not None:
+            write_generation(txn.path(GENERATION_FILE), store, g, vectors, meta=meta, fsync=txn.fsync)
+        else:
+            with self.transaction(g) as own:
+                write_generation(own.path(GENERATION_FILE), store, g, vectors, meta=meta, fsync=own.fsync)
+        self._after_commit(txn, lambda: self.record_manifest(g, count=len(store), artifacts={"population": filepath}))
+        return filepath
+
+    def save_metadata(self, g: int, count: int, txn: Optional[GenerationWriter] = None):
         meta = {
             "generation": g, 
             "count": count, 
             "timestamp": datetime.datetime.now().isoformat()
         }
-        with open(os.path.join(g_dir, "metadata.json"), 'w', encoding='utf-8') as f:
-             json.dump(meta, f, indent=2)
+        self._write_json(g, "metadata.json", meta, txn)
+        population_path = os.path.join(self.generation_dir(g), "population.json")
+        self._after_commit(txn, lambda: self.record_manifest(g, count=count, timestamp=meta["timestamp"],
+                                                             artifacts={"population": population_path}))
+
+    def load_metadata(self, g: int) -> Optional[Dict[str, Any]]:
+        filepath = os.path.join(self.generation_dir(g), "metadata.json")
+        if not os.path.exists(filepath):
+            return None
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f)
 
-    def save_keywords(self, g: int, population: List[Dict[str, Any]]):
-        g_dir = self.ensure_generation_dir(g)
+    def save_keywords(self, g: int, population: List[Dict[str, Any]], txn: Optional[GenerationWriter] = None):
         keywords = list(set(p['content'] for p in population))
         keywords.sort()
-        with open(os.path.join(g_dir, "keywords.json"), 'w', encoding='utf-8') as f:
-            json.dump(keywords, f, indent=2, ensure_ascii=False)
+        self._write_json(g, "keywords.json", keywords, txn)
+
+    def save_situation(self, g: int, situation_data: Dict[str, Any], txn: Optional[GenerationWriter] = None):
+        self._write_json(g, "situation.json", situation_data, txn)
 
-    def save_situation(self, g: int, situation_data: Dict[str, Any]):
-        g_dir = self.ensure_generation_dir(g)
-        with open(os.path.join(g_dir, "situation.json"), 'w', encoding='utf-8') as f:
-            json.dump(situation_data, f, indent=2, ensure_ascii=False)
+    def save_artifact_status(self, g: int, status: Dict[str, Any], txn: Optional[GenerationWriter] = None):
+        self._write_json(g, "artifacts.json", status, txn)
+        if status.get("status") == "done":
+            g_dir = self.generation_dir(g)
+            names = set(status.get("artifacts", []))
+            artifacts = {key: os.path.join(g_dir, filename) for key, filename in ARTIFACT_FILES.items() if filename in names}
+            self._after_commit(txn, lambda: self.record_manifest(g, artifacts=artifacts))
+
+    def load_artifact_status(self, g: int) -> Optional[Dict[str, Any]]:
+        filepath = os.path.join(self.generation_dir(g), "artifacts.json")
+        if not os.path.exists(filepath):
+            return None
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f)
@@ -0,0 +1,78 @@
+"""
+Batched parent selection.
+
+Draws every parent pair of a generation in one vectorized call over the fitness
+array, instead of one toolbox.select call per parent.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+METHODS = ("tournament", "roulette", "rank")
+
+def build_alias_table(weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vose's alias method: O(N) table construction for O(1) weighted sampling.
+    Returns (prob, alias).
+    """
+    n = len(weights)
+    total = weights.sum()
+    if n == 0 or total <= 0:
+        return np.ones(n), np.arange(n)
+
+    scaled = weights * (n / total)
+    prob = np.ones(n)
+    alias = np.arange(n)
+    small = list(np.flatnonzero(scaled < 1.0))
+    large = list(np.flatnonzero(scaled >= 1.0))
+    while small and large:
+        s = small.pop()
+        l = large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] -= 1.0 - scaled[s]
+        if scaled[l] < 1.0:
+            small.append(l)
+        else:
+            large.append(l)
+    # Leftovers are 1.0 up to rounding
+    return prob, alias
+
+def sample_alias(prob: np.ndarray, alias: np.ndarray, size: int, rng: np.random.Generator) -> np.ndarray:
+    column = rng.integers(0, len(prob), size)
+    return np.where(rng.random(size) < prob[column], column, alias[column])
+
+def select_parent_pairs(fitness, n_pairs: int, method: str = "tournament", tournsize: int = 3,
+                        rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Draws n_pairs parent pairs as an (n_pairs, 2) array of indices into fitness.
+
+    tournament: each parent is the fittest of tournsize uniform draws.
+    roulette:   fitness-proportional (negative fitness counts as 0), via the alias method.
+    rank:       proportional to fitness rank (1 = weakest), via the alias method.
+    Cost is O(N + n_pairs) (rank adds one sort of the fitness array).
+    """
+    fitness = np.asarray(fitness, dtype=np.float64)
+    rng = rng if rng is not None else np.random.default_rng()
+    n = len(fitness)
+    size = 2 * n_pairs
+    if n == 0 or n_pairs <= 0:
+        return np.zeros((0, 2), dtype=np.int64)
+
+    if method == "tournament":
+        contestants = rng.integers(0, n, (size, tournsize))
+        winners = contestants[np.arange(size), fitness[contestants].argmax(axis=1)]
+    elif method == "roulette":
+        weights = np.clip(fitness, 0.0, None)
+        if weights.max() <= 0:
+            # Nobody has positive fitness: draw uniformly
+            weights = np.ones(n)
+        winners = sample_alias(*build_alias_table(weights), size, rng)
+    elif method == "rank":
+        weights = np.empty(n)
+        weights[np.argsort(fitness, kind="stable")] = np.arange(1, n + 1)
+        winners = sample_alias(*build_alias_table(weights), size, rng)
+    else:
+        raise ValueError(f"Unknown selection method '{method}'. Choose from {METHODS}.")
+
+    return winners.reshape(n_pairs, 2)
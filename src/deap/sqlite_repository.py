@@ -0,0 +1,251 @@
+"""
+SQLite-backed Repository.
+
+Populations live in one database (data/mindmutant.db, WAL mode) instead of
+data/g{n}/population.json, so questions across generations are single indexed
+queries. Injected words and viewer artifacts (keywords, situation, wordcrowd)
+still go to data/g{n}/ as with the JSON repository.
+
+Tables:
+    individuals  (id, content, content_hash, first_generation)   one row per individual id
+    membership   (generation, island, position, individual_id, novelty)
+    parentage    (child_id, parent_id)
+    generations  (generation, island, count, timestamp)
+"""
+import os
+import sqlite3
+import hashlib
+import datetime
+from typing import List, Dict, Any, Optional
+
+from src.deap.repository import Repository
+from src.deap.generation_writer import GenerationWriter
+
+DB_FILENAME = "mindmutant.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS individuals (
+    id TEXT PRIMARY KEY,
+    content TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    first_generation INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_individuals_content_hash ON individuals(content_hash);
+CREATE INDEX IF NOT EXISTS idx_individuals_first_generation ON individuals(first_generation);
+
+CREATE TABLE IF NOT EXISTS membership (
+    generation INTEGER NOT NULL,
+    island INTEGER NOT NULL DEFAULT -1,
+    position INTEGER NOT NULL,
+    individual_id TEXT NOT NULL,
+    novelty REAL,
+    PRIMARY KEY (generation, island, position)
+);
+CREATE INDEX IF NOT EXISTS idx_membership_individual ON membership(individual_id);
+
+CREATE TABLE IF NOT EXISTS parentage (
+    child_id TEXT NOT NULL,
+    parent_id TEXT NOT NULL,
+    PRIMARY KEY (child_id, parent_id)
+);
+CREATE INDEX IF NOT EXISTS idx_parentage_parent ON parentage(parent_id);
+
+CREATE TABLE IF NOT EXISTS generations (
+    generation INTEGER NOT NULL,
+    island INTEGER NOT NULL DEFAULT -1,
+    count INTEGER NOT NULL,
+    timestamp TEXT NOT NULL,
+    PRIMARY KEY (generation, island)
+);
+"""
+
+def content_hash(content: str) -> str:
+    """Hash of whitespace-normalized content."""
+    return hashlib.blake2b(" ".join(content.split()).encode('utf-8'), digest_size=16).hexdigest()
+
+class SQLiteRepository(Repository):
+    """
+    Drop-in Repository for Evolution (storage="sqlite"), plus history queries.
+
+    Args:
+        island: Island index for island-model runs (None for the main population).
+        db_path: Database file (defaults to data/mindmutant.db).
+    """
+
+    def __init__(self, island: Optional[int] = None, db_path: Optional[str] = None):
+        super().__init__(island=island, backend="json")
+        self.backend = "sqlite"
+        self.db_path = db_path or os.path.join(self.data_dir, DB_FILENAME)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        # Island processes share the file; WAL lets readers run while one writer commits
+        self.conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    @property
+    def island_key(self) -> int:
+        return -1 if self.island is None else self.island
+
+    def close(self):
+        self.conn.close()
+
+    # Repository interface
+
+    def generation_file(self, g: int):
+        """data/g{g}/generation.bin of a generation saved with the binary backend and never stored here."""
+        if self._has_generation(g):
+            return None
+        return super().generation_file(g)
+
+    def _has_generation(self, g: int) -> bool:
+        row = self.conn.execute(
+            "SELECT 1 FROM membership WHERE generation = ? AND island = ? LIMIT 1", (g, self.island_key)
+        ).fetchone()
+        return row is not None
+
+    def load_generation(self, g: int) -> List[Dict[str, Any]]:
+        """Generation g from the database, falling back to its JSON files if it was never stored here."""
+        rows = self.conn.execute(
+            """
+            SELECT m.individual_id AS id, i.content AS content, m.novelty AS novelty,
+                   (SELECT group_concat(p.parent_id) FROM parentage p WHERE p.child_id = m.individual_id) AS parents
+            FROM membership m JOIN individuals i ON i.id = m.individual_id
+            WHERE m.generation = ? AND m.island = ?
+            ORDER BY m.position
+            """,
+            (g, self.island_key)
+        ).fetchall()
+        if not rows:
+            return super().load_generation(g)
+        return [
+            {
+                "id": row["id"],
+                "content": row["content"],
+                "fitness": {"novelty": row["novelty"] if row["novelty"] is not None else 0.0},
+                "tags": [],
+                "parents": row["parents"].split(",") if row["parents"] else []
+            }
+            for row in rows
+        ]
+
+    def save_population(self, g: int, population: List[Dict[str, Any]], txn: Optional[GenerationWriter] = None):
+        # The database commits on its own; txn only carries the files written to data/g{g}/
+        island = self.island_key
+        with self.conn:
+            self.conn.executemany(
+                # first_generation keeps the earliest generation however generations are (re)saved
+                "INSERT INTO individuals (id, content, content_hash, first_generation) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET first_generation = MIN(first_generation, excluded.first_generation)",
+                [(item['id'], item['content'], content_hash(item['content']), g) for item in population]
+            )
+            # Re-saving a generation replaces its membership
+            self.conn.execute("DELETE FROM membership WHERE generation = ? AND island = ?", (g, island))
+            self.conn.executemany(
+                "INSERT INTO membership (generation, island, position, individual_id, novelty) VALUES (?, ?, ?, ?, ?)",
+                [(g, island, position, item['id'], item.get('fitness', {}).get('novelty'))
+                 for position, item in enumerate(population)]
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO parentage (child_id, parent_id) VALUES (?, ?)",
+                [(item['id'], parent) for item in population for parent in item.get('parents', ())]
+            )
+
+    def save_metadata(self, g: int, count: int, txn: Optional[GenerationWriter] = None):
+        timestamp = datetime.datetime.now().isoformat()
+        self._save_generation_row(g, count, timestamp)
+        self._after_commit(txn, lambda: self.record_manifest(g, count=count, timestamp=timestamp,
+                                                             artifacts={"population": self.db_path}))
+
+    def _save_generation_row(self, g: int, count: int, timestamp: str):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO generations (generation, island, count, timestamp) VALUES (?, ?, ?, ?)",
+                (g, self.island_key, count, timestamp)
+            )
+
+    # History queries
+
+    def latest_generation(self) -> int:
+        """Highest stored generation of this island (or the main population), -1 if none."""
+        row = self.conn.execute(
+            "SELECT MAX(generation) FROM generations WHERE island = ?", (self.island_key,)
+        ).fetchone()
+        return row[0] if row[0] is not None else -1
+
+    def first_appearance(self, content: str) -> Optional[Dict[str, Any]]:
+        """First generation (and individual) in which content appeared, or None."""
+        row = self.conn.execute(
+            "SELECT id, content, first_generation FROM individuals WHERE content_hash = ? "
+            "ORDER BY first_generation LIMIT 1",
+            (content_hash(content),)
+        ).fetchone()
+        return {"id": row["id"], "content": row["content"], "generation": row["first_generation"]} if row else None
+
+    def novelty_trend(self, start: Optional[int] = None, end: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Per-generation count and novelty min/mean/max."""
+        rows = self.conn.execute(
+            """
+            SELECT generation, COUNT(*) AS count, MIN(novelty) AS min, AVG(novelty) AS mean, MAX(novelty) AS max
+            FROM membership
+            WHERE island = ? AND generation >= ? AND generation <= ?
+            GROUP BY generation ORDER BY generation
+            """,
+            (self.island_key, start if start is not None else -1, end if end is not None else 2 ** 62)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def ancestors(self, individual_id: str, max_depth: int = 50) -> List[Dict[str, Any]]:
+        """Every known ancestor of an individual with its depth (1 = parent), nearest first."""
+        rows = self.conn.execute(
+            """
+            WITH RECURSIVE lineage(id, depth) AS (
+                SELECT parent_id, 1 FROM parentage WHERE child_id = ?
+                UNION
+                SELECT p.parent_id, l.depth + 1 FROM parentage p JOIN lineage l ON p.child_id = l.id
+                WHERE l.depth < ?
+            )
+            SELECT l.id AS id, MIN(l.depth) AS depth, i.content AS content, i.first_generation AS generation
+            FROM lineage l LEFT JOIN individuals i ON i.id = l.id
+            GROUP BY l.id ORDER BY depth, generation
+            """,
+            (individual_id, max_depth)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def descendants(self, individual_id: str, max_depth: int = 50) -> List[Dict[str, Any]]:
+        """Every known descendant of an individual with its depth (1 = child), nearest first."""
+        rows = self.conn.execute(
+            """
+            WITH RECURSIVE offspring(id, depth) AS (
+                SELECT child_id, 1 FROM parentage WHERE parent_id = ?
+                UNION
+                SELECT p.child_id, o.depth + 1 FROM parentage p JOIN offspring o ON p.parent_id = o.id
+                WHERE o.depth < ?
+            )
+            SELECT o.id AS id, MIN(o.depth) AS depth, i.content AS content, i.first_generation AS generation
+            FROM offspring o LEFT JOIN individuals i ON i.id = o.id
+            GROUP BY o.id ORDER BY depth, generation
+            """,
+            (individual_id, max_depth)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def import_json_generations(self) -> int:
+        """
+        Loads every data/g{n}/population.json into the database. Returns the number of generations imported.
+        Each generation keeps the timestamp of its metadata.json; the manifest still points at the JSON files.
+        """
+        json_repo = Repository(island=self.island, backend="json")
+        imported = 0
+        generations = sorted(int(name[1:]) for name in os.listdir(self.data_dir)
+                             if name.startswith('g') and name[1:].isdigit())
+        for g in generations:
+            records = json_repo.load_generation(g)
+            if records:
+                self.save_population(g, records)
+                metadata = json_repo.load_metadata(g) or {}
+                self._save_generation_row(g, len(records), metadata.get("timestamp") or datetime.datetime.now().isoformat())
+                imported += 1
+        return imported
@@ -2,15 +2,20 @@ import random
 from typing import List, Dict, Any
 
 class Starvation:
+    def __init__(self, period: int = 3, phase: int = 0):
+        # Disasters hit generations where (next_g + phase) % period == 0
+        self.period = period
+        self.phase = phase
+
     def reap_population(self, population: List[Any], next_g: int, force: bool = False) -> List[Any]:
         """
         Applies disaster/starvation logic.
-        Every 3 generations, kills half the population based on weakness (low novelty).
+        Every `period` generations (3 by default), kills half the population based on weakness (low novelty).
         If force=True, executes disaster regardless of generation count.
         Supports both Dict-based population and DEAP Individual objects.
         """
-        # Disaster Event check: g3, g6, g9... or Forced
-        if force or (next_g > 0 and next_g % 3 == 0):
+        # Disaster Event check: g3, g6, g9... (shifted by phase) or Forced
+        if force or (next_g > 0 and (next_g + self.phase) % self.period == 0):
             reason = "FORCED DISASTER" if force else "SCHEDULED DISASTER"
             print(f"⚠️  {reason} in g{next_g}! Half of the population will perish.")
             
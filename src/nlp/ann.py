@@ -0,0 +1,139 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.nlp.vectorizer import Vectorizer
+
+class LSHIndex:
+    """
+    Approximate top-k cosine neighbour index using random-projection LSH.
+
+    Every table hashes a vector to an n_bits code from the signs of its projections
+    onto random hyperplanes. Codes are kept sorted per table, so a bucket lookup is
+    a searchsorted range and insertion is a merge rather than a rebuild.
+    Candidates from all probed buckets are re-ranked by exact cosine similarity.
+
+    Recall/latency knobs:
+        n_tables: more tables -> higher recall, more memory and candidates.
+        n_bits: more bits -> smaller buckets, lower latency, lower recall.
+        n_probes: extra buckets probed per table by flipping the least certain bits.
+    """
+
+    def __init__(self, dim: int, n_tables: int = 12, n_bits: int = 16, n_probes: int = 4, seed: int = 0, capacity: int = 1024):
+        if not 1 <= n_bits <= 32:
+            raise ValueError("n_bits must be between 1 and 32")
+        self.dim = dim
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.n_probes = n_probes
+
+        rng = np.random.default_rng(seed)
+        self._planes = rng.standard_normal((n_tables, n_bits, dim)).astype(np.float32)
+        self._weights = (1 << np.arange(n_bits, dtype=np.int64))
+
+        self._size = 0
+        self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self._sorted_codes = [np.zeros(0, dtype=np.int64) for _ in range(n_tables)]
+        self._sorted_rows = [np.zeros(0, dtype=np.int64) for _ in range(n_tables)]
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """Normalized vectors in insertion order (row i is index i)."""
+        return self._vectors[:self._size]
+
+    def add(self, vectors) -> np.ndarray:
+        """Inserts vectors and returns their row indices."""
+        vectors = Vectorizer.normalize(vectors)
+        n = len(vectors)
+        rows = np.arange(self._size, self._size + n)
+        if n == 0:
+            return rows
+
+        if self._size + n > len(self._vectors):
+            capacity = max(self._size + n, 2 * len(self._vectors))
+            grown = np.zeros((capacity, self.dim), dtype=np.float32)
+            grown[:self._size] = self._vectors[:self._size]
+            self._vectors = grown
+        self._vectors[self._size:self._size + n] = vectors
+        self._size += n
+
+        codes = self._hash(vectors)
+        for t in range(self.n_tables):
+            order = np.argsort(codes[t], kind="stable")
+            new_codes = codes[t][order]
+            pos = np.searchsorted(self._sorted_codes[t], new_codes, side="right")
+            self._sorted_codes[t] = np.insert(self._sorted_codes[t], pos, new_codes)
+            self._sorted_rows[t] = np.insert(self._sorted_rows[t], pos, rows[order])
+        return rows
+
+    def query(self, vectors, k: int = 1, n_probes: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (indices, similarities), each of shape (len(vectors), k), best first.
+        Missing neighbours (too few candidates) are reported as index -1 with similarity 0.0.
+        """
+        queries = Vectorizer.normalize(vectors)
+        n_probes = self.n_probes if n_probes is None else n_probes
+        indices = np.full((len(queries), k), -1, dtype=np.int64)
+        sims = np.zeros((len(queries), k), dtype=np.float32)
+        if self._size == 0:
+            return indices, sims
+
+        projections = np.einsum("tbd,qd->qtb", self._planes, queries)
+        for i, proj in enumerate(projections):
+            candidates = self._candidates(proj, n_probes)
+            if len(candidates) == 0:
+                continue
+            cand_sims = self._vectors[candidates] @ queries[i]
+            top = min(k, len(candidates))
+            best = np.argpartition(-cand_sims, top - 1)[:top]
+            best = best[np.argsort(-cand_sims[best])]
+            indices[i, :top] = candidates[best]
+            sims[i, :top] = cand_sims[best]
+        return indices, sims
+
+    def exact_query(self, vectors, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """Brute-force reference for query(), used to measure recall."""
+        queries = Vectorizer.normalize(vectors)
+        indices = np.full((len(queries), k), -1, dtype=np.int64)
+        out = np.zeros((len(queries), k), dtype=np.float32)
+        if self._size == 0:
+            return indices, out
+        all_sims = queries @ self.vectors.T
+        top = min(k, self._size)
+        best = np.argpartition(-all_sims, top - 1, axis=1)[:, :top]
+        best_sims = np.take_along_axis(all_sims, best, axis=1)
+        order = np.argsort(-best_sims, axis=1)
+        indices[:, :top] = np.take_along_axis(best, order, axis=1)
+        out[:, :top] = np.take_along_axis(best_sims, order, axis=1)
+        return indices, out
+
+    def _hash(self, vectors: np.ndarray) -> np.ndarray:
+        """Returns (n_tables, n) codes."""
+        bits = np.einsum("tbd,nd->tnb", self._planes, vectors) > 0
+        return bits.astype(np.int64) @ self._weights
+
+    def _candidates(self, proj: np.ndarray, n_probes: int) -> np.ndarray:
+        """Collects candidate rows from the query's bucket and n_probes neighbouring buckets per table."""
+        bits = proj > 0
+        codes = bits.astype(np.int64) @ self._weights
+        probes = [codes]
+        if n_probes > 0:
+            # Flip the bits whose projections are closest to the hyperplane
+            uncertain = np.argsort(np.abs(proj), axis=1)[:, :min(n_probes, self.n_bits)]
+            probes.append(codes[:, None] ^ self._weights[uncertain])
+        probe_codes = np.column_stack(probes)
+
+        found = []
+        for t in range(self.n_tables):
+            table = self._sorted_codes[t]
+            lo = np.searchsorted(table, probe_codes[t], side="left")
+            hi = np.searchsorted(table, probe_codes[t], side="right")
+            for a, b in zip(lo, hi):
+                if b > a:
+                    found.append(self._sorted_rows[t][a:b])
+        if not found:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate(found))
@@ -1,13 +1,18 @@
 from typing import List, Dict, Tuple, Optional
+import numpy as np
 from src.nlp.vectorizer import Vectorizer
 
 class Evaluator:
-    def __init__(self, vectorizer: Vectorizer):
+    def __init__(self, vectorizer: Vectorizer, block_size: int = 1024):
         self.vectorizer = vectorizer
+        self.block_size = block_size
 
     def vectorize(self, text: str) -> List[float]:
         return self.vectorizer.get_vector(text)
 
+    def vectorize_batch(self, texts: List[str]):
+        return self.vectorizer.get_vectors(texts)
+
     def calculate_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         return self.vectorizer.calculate_similarity(vec1, vec2)
 
@@ -40,3 +45,41 @@ class Evaluator:
                 worst_mate = other_id
                 
         return best_mate, best_sim, worst_mate, worst_sim
+
+    def find_all_neighbors(self, ids: List[str], matrix, block_size: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Finds the nearest and furthest neighbors of every row in matrix at once.
+        Similarities are computed block_size rows at a time, so peak memory is (block_size, N).
+        Returns (best_mate_ids, best_sims, worst_mate_ids, worst_sims) aligned with ids.
+        Rows without any other individual get (None, -2.0, None, 2.0) like find_neighbors.
+        """
+        n = len(ids)
+        best_ids = np.full(n, None, dtype=object)
+        worst_ids = np.full(n, None, dtype=object)
+        best_sims = np.full(n, -2.0)
+        worst_sims = np.full(n, 2.0)
+        if n < 2:
+            return best_ids, best_sims, worst_ids, worst_sims
+
+        ids_arr = np.array(ids, dtype=object)
+        normed = Vectorizer.normalize(matrix)
+        block_size = block_size or self.block_size
+
+        for start in range(0, n, block_size):
+            stop = min(start + block_size, n)
+            sims = normed[start:stop] @ normed.T
+            rows = np.arange(stop - start)
+
+            # Exclude each row's own entry from both searches
+            sims[rows, rows + start] = -np.inf
+            best = sims.argmax(axis=1)
+            best_sims[start:stop] = sims[rows, best]
+
+            sims[rows, rows + start] = np.inf
+            worst = sims.argmin(axis=1)
+            worst_sims[start:stop] = sims[rows, worst]
+
+            best_ids[start:stop] = ids_arr[best]
+            worst_ids[start:stop] = ids_arr[worst]
+
+        return best_ids, best_sims, worst_ids, worst_sims
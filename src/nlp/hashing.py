@@ -0,0 +1,70 @@
+from typing import List, Tuple
+
+import numpy as np
+
+# 64-bit mixing constants (splitmix64 finalizer)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+_PRIME = np.uint64(0x100000001B3)
+
+class HashingEmbedder:
+    """
+    Deterministic character n-gram hashing embedder.
+
+    Each text is padded with a space on both sides and split into character n-grams
+    (by Unicode code point, so Japanese needs no tokenizer). Every n-gram is hashed
+    into one of dim buckets with a +/-1 sign, and rows are L2-normalized.
+    Texts sharing n-grams get similar vectors, so "LDR Neon" and "Neon LDR" stay close.
+    Whole batches are embedded with NumPy at once; no model download is needed.
+    """
+
+    def __init__(self, dim: int = 256, ngram_range: Tuple[int, int] = (1, 3), seed: int = 0):
+        self.dim = dim
+        self.ngram_range = ngram_range
+        self.seed = np.uint64(seed)
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Returns a (len(texts), dim) float32 matrix."""
+        n_texts = len(texts)
+        if n_texts == 0:
+            return np.zeros((0, self.dim), dtype=np.float32)
+
+        padded = [f" {text} " for text in texts]
+        lengths = np.array([len(p) for p in padded])
+        codes = np.frombuffer("".join(padded).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+        doc = np.repeat(np.arange(n_texts), lengths)
+        spaces = np.concatenate([[0], np.cumsum(codes == 32)])
+
+        buckets = []
+        signs = []
+        docs = []
+        with np.errstate(over="ignore"):
+            for n in range(self.ngram_range[0], self.ngram_range[1] + 1):
+                count = len(codes) - n + 1
+                if count <= 0:
+                    continue
+                # Keep only windows that stay inside one text and are not all padding
+                valid = doc[:count] == doc[n - 1:n - 1 + count]
+                valid &= (spaces[n:n + count] - spaces[:count]) < n
+                h = np.full(count, self.seed + np.uint64(n), dtype=np.uint64)
+                for j in range(n):
+                    h = h * _PRIME + codes[j:j + count]
+                h = _mix(h)[valid]
+                buckets.append((h % np.uint64(self.dim)).astype(np.int64))
+                signs.append(np.where(h >> np.uint64(63), -1.0, 1.0))
+                docs.append(doc[:count][valid])
+
+        flat = np.concatenate(docs) * self.dim + np.concatenate(buckets)
+        matrix = np.bincount(flat, weights=np.concatenate(signs), minlength=n_texts * self.dim)
+        matrix = matrix.reshape(n_texts, self.dim).astype(np.float32)
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+def _mix(h: np.ndarray) -> np.ndarray:
+    h = h ^ (h >> np.uint64(30))
+    h = h * _MIX1
+    h = h ^ (h >> np.uint64(27))
+    h = h * _MIX2
+    return h ^ (h >> np.uint64(31))
@@ -0,0 +1,197 @@
+import os
+import hashlib
+from typing import List, Tuple, Dict
+
+import numpy as np
+
+# Fraction of the capacity evicted at once when the cache is full, so the LRU scan is amortized
+EVICT_FRACTION = 16
+
+class VectorCache:
+    """
+    Persistent, content-addressed cache of text vectors.
+
+    Vectors are stored row-wise in a memory-mapped float32 matrix (vectors.npy).
+    Two row-aligned memory-mapped arrays hold the 64-bit hash of (model name,
+    content) of each row (keys.npy, 0 = empty) and its last-access tick for LRU
+    eviction (ticks.npy). Stores and lookups only touch the rows involved; the
+    sorted key index is kept in memory, built once on open and updated by merging.
+    flush() (called on checkpoints and close) writes the dirty pages back.
+    """
+
+    def __init__(self, cache_dir: str, model_name: str, dim: int, capacity: int = 4096, max_entries: int = 1 << 22):
+        self.model_name = model_name
+        self.dim = dim
+        self.max_entries = max_entries
+        self.dir = os.path.join(cache_dir, f"{model_name}-{dim}")
+        self.vectors_path = os.path.join(self.dir, "vectors.npy")
+        self.keys_path = os.path.join(self.dir, "keys.npy")
+        self.ticks_path = os.path.join(self.dir, "ticks.npy")
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(self.dir, exist_ok=True)
+        if all(os.path.exists(p) for p in (self.vectors_path, self.keys_path, self.ticks_path)):
+            self._vectors = np.lib.format.open_memmap(self.vectors_path, mode="r+")
+            self._keys = np.lib.format.open_memmap(self.keys_path, mode="r+")
+            self._ticks = np.lib.format.open_memmap(self.ticks_path, mode="r+")
+        else:
+            capacity = max(1, min(capacity, max_entries))
+            self._vectors = np.lib.format.open_memmap(self.vectors_path, mode="w+", dtype=np.float32, shape=(capacity, dim))
+            self._keys = self._create(self.keys_path, np.zeros(capacity, dtype=np.uint64))
+            self._ticks = self._create(self.ticks_path, np.zeros(capacity, dtype=np.int64))
+        self._clock = int(self._ticks.max()) if len(self._ticks) else 0
+        self._free = np.flatnonzero(self._keys == 0)
+        self._reindex()
+
+    @staticmethod
+    def _create(path: str, array: np.ndarray) -> np.memmap:
+        memmap = np.lib.format.open_memmap(path, mode="w+", dtype=array.dtype, shape=array.shape)
+        memmap[:] = array
+        return memmap
+
+    def __len__(self) -> int:
+        return len(self._sorted_keys)
+
+    def key(self, text: str) -> int:
+        """Returns the 64-bit content hash for text under this cache's model."""
+        digest = hashlib.blake2b(f"{self.model_name}\x00{text}".encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little") or 1
+
+    def lookup(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Looks up vectors for texts.
+        Returns (vectors, hit_mask); rows for misses are left as zeros.
+        """
+        keys = np.array([self.key(t) for t in texts], dtype=np.uint64)
+        rows = self._find(keys)
+        hit = rows >= 0
+
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        if hit.any():
+            vectors[hit] = self._vectors[rows[hit]]
+            self._clock += 1
+            self._ticks[rows[hit]] = self._clock
+
+        n_hits = int(hit.sum())
+        self.hits += n_hits
+        self.misses += len(texts) - n_hits
+        return vectors, hit
+
+    def store(self, texts: List[str], vectors: np.ndarray):
+        """Stores vectors for texts, evicting least recently used rows when full."""
+        keys = np.array([self.key(t) for t in texts], dtype=np.uint64)
+        keys, first = np.unique(keys, return_index=True)
+        vectors = np.asarray(vectors, dtype=np.float32)[first]
+        if len(keys) > self.max_entries:
+            keys, vectors = keys[-self.max_entries:], vectors[-self.max_entries:]
+
+        rows = self._find(keys)
+        new = rows < 0
+        if new.any():
+            rows[new] = self._allocate(int(new.sum()), keep=rows[~new])
+            self._insert(keys[new], rows[new])
+
+        # Vectors before keys, so a key never points at a row that is still being written
+        self._vectors[rows] = vectors
+        self._keys[rows] = keys
+        self._clock += 1
+        self._ticks[rows] = self._clock
+
+    def flush(self):
+        """Writes dirty vector, key and tick pages to disk."""
+        self._vectors.flush()
+        self._keys.flush()
+        self._ticks.flush()
+
+    def close(self):
+        self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self),
+            "capacity": len(self._keys),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _reindex(self):
+        occupied = np.flatnonzero(self._keys)
+        order = np.argsort(self._keys[occupied])
+        self._sorted_rows = occupied[order]
+        self._sorted_keys = np.array(self._keys[self._sorted_rows])
+
+    def _insert(self, keys: np.ndarray, rows: np.ndarray):
+        """Merges sorted new keys (and their rows) into the sorted index."""
+        pos = np.searchsorted(self._sorted_keys, keys)
+        self._sorted_keys = np.insert(self._sorted_keys, pos, keys)
+        self._sorted_rows = np.insert(self._sorted_rows, pos, rows)
+
+    def _remove(self, keys: np.ndarray):
+        pos = np.searchsorted(self._sorted_keys, keys)
+        self._sorted_keys = np.delete(self._sorted_keys, pos)
+        self._sorted_rows = np.delete(self._sorted_rows, pos)
+
+    def _find(self, keys: np.ndarray) -> np.ndarray:
+        """Returns the row of each key, or -1 if it is not cached."""
+        rows = np.full(len(keys), -1, dtype=np.int64)
+        if len(self._sorted_keys) == 0 or len(keys) == 0:
+            return rows
+        pos = np.searchsorted(self._sorted_keys, keys)
+        pos = np.minimum(pos, len(self._sorted_keys) - 1)
+        found = self._sorted_keys[pos] == keys
+        rows[found] = self._sorted_rows[pos[found]]
+        return rows
+
+    def _allocate(self, n: int, keep: np.ndarray) -> np.ndarray:
+        """
+        Returns n free rows, growing the matrix or evicting LRU rows as needed.
+        Rows in keep are never evicted.
+        """
+        if len(self._free) < n and len(self._keys) < self.max_entries:
+            self._grow(len(self._keys) - len(self._free) + n)
+
+        if len(self._free) < n:
+            # Evict a chunk of the oldest rows, not just n, so the full scan runs rarely
+            n_evict = min(max(n - len(self._free), len(self._keys) // EVICT_FRACTION),
+                          len(self._keys) - len(self._free) - len(keep))
+            ticks = np.array(self._ticks)
+            ticks[keep] = np.iinfo(np.int64).max
+            ticks[self._free] = np.iinfo(np.int64).max
+            oldest = np.argpartition(ticks, n_evict - 1)[:n_evict]
+            self._remove(np.sort(self._keys[oldest]))
+            self._keys[oldest] = 0
+            self._ticks[oldest] = 0
+            self.evictions += n_evict
+            self._free = np.concatenate([self._free, oldest])
+
+        rows, self._free = self._free[:n], self._free[n:]
+        return rows
+
+    def _grow(self, required: int):
+        capacity = len(self._keys)
+        while capacity < required:
+            capacity *= 2
+        capacity = min(capacity, self.max_entries)
+
+        old = len(self._keys)
+        self._resize("_vectors", self.vectors_path, (capacity, self.dim))
+        self._resize("_keys", self.keys_path, (capacity,))
+        self._resize("_ticks", self.ticks_path, (capacity,))
+        self._free = np.concatenate([self._free, np.arange(old, capacity)])
+
+    def _resize(self, attr: str, path: str, shape: Tuple[int, ...]):
+        """Copies a memory-mapped array into a larger file and replaces it."""
+        old = getattr(self, attr)
+        tmp_path = path + ".tmp.npy"
+        resized = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=old.dtype, shape=shape)
+        resized[:len(old)] = old
+        resized.flush()
+        # Release the old mapping before replacing its file (required on Windows)
+        del resized, old
+        setattr(self, attr, None)
+        os.replace(tmp_path, path)
+        setattr(self, attr, np.lib.format.open_memmap(path, mode="r+"))
@@ -0,0 +1,155 @@
+"""
+Vectors-only model tables.
+
+A table is a model's vectors pruned to the project vocabulary, stored as a
+memory-mapped float32 .npy with a token -> row index next to it:
+
+    data/vectors/{model}.npy          (n_tokens, dim) float32
+    data/vectors/{model}.tokens.json  ["token", ...] in row order
+
+Exporting needs spaCy and the model; reading a table needs only NumPy, and
+processes that map the same file share it through the page cache.
+
+Usage: python -m src.nlp.vector_table [--model ja_core_news_md] [--data-dir data]
+Then run with MINDMUTANT_VECTORIZER=table (and MINDMUTANT_MODEL set to the same model).
+"""
+import os
+import sys
+import json
+import glob
+import argparse
+from typing import List, Tuple, Iterable
+
+import numpy as np
+
+def table_paths(table_dir: str, model_name: str) -> Tuple[str, str]:
+    return (
+        os.path.join(table_dir, f"{model_name}.npy"),
+        os.path.join(table_dir, f"{model_name}.tokens.json"),
+    )
+
+class VectorTable:
+    """Read-only token vector table backed by a memory-mapped .npy."""
+
+    def __init__(self, table_dir: str, model_name: str):
+        vectors_path, tokens_path = table_paths(table_dir, model_name)
+        self.model_name = model_name
+        self.vectors = np.load(vectors_path, mmap_mode='r')
+        with open(tokens_path, 'r', encoding='utf-8') as f:
+            tokens = json.load(f)
+        self.index = {token: row for row, token in enumerate(tokens)}
+        self.dim = self.vectors.shape[1]
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @staticmethod
+    def exists(table_dir: str, model_name: str) -> bool:
+        return all(os.path.exists(p) for p in table_paths(table_dir, model_name))
+
+    def embed(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (vectors, found_mask). Each text vector is the mean of the rows of its
+        whitespace tokens that are in the table; texts with no known token are not found.
+        """
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        rows = []
+        owners = []
+        for i, text in enumerate(texts):
+            for token in text.split():
+                row = self.index.get(token)
+                if row is not None:
+                    rows.append(row)
+                    owners.append(i)
+        if not rows:
+            return matrix, np.zeros(len(texts), dtype=bool)
+
+        owners = np.array(owners)
+        counts = np.bincount(owners, minlength=len(texts))
+        np.add.at(matrix, owners, self.vectors[np.array(rows)])
+        found = counts > 0
+        matrix[found] /= counts[found, None]
+        return matrix, found
+
+def collect_vocabulary(data_dir: str, extra_words: Iterable[str] = ()) -> List[str]:
+    """
+    Project vocabulary: words from the g0 domain JSONs, tokens of every individual
+    in data/g*/population.json (or generation.bin), and extra_words (e.g. mutation connectors).
+    """
+    from src.deap.generation_file import GenerationFile, FILENAME
+
+    vocab = set(extra_words)
+    g0_dir = os.path.join(data_dir, 'g0')
+    skip = {'population.json', 'metadata.json', 'situation.json', 'keywords.json'}
+    for path in glob.glob(os.path.join(g0_dir, '*.json')):
+        if os.path.basename(path) in skip:
+            continue
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, list):
+                for word in data:
+                    vocab.update(str(word).split())
+        except Exception as e:
+            print(f"Error loading {path}: {e}")
+
+    for path in glob.glob(os.path.join(data_dir, 'g*', 'population.json')):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for item in json.load(f):
+                    vocab.update(item.get('content', '').split())
+        except Exception as e:
+            print(f"Error loading {path}: {e}")
+
+    for path in glob.glob(os.path.join(data_dir, 'g*', FILENAME)):
+        try:
+            vocab.update(GenerationFile(path).vocabulary())
+        except Exception as e:
+            print(f"Error loading {path}: {e}")
+
+    return sorted(vocab)
+
+def export_vector_table(model_name: str, words: List[str], table_dir: str, batch_size: int = 256) -> int:
+    """
+    Exports model vectors for words into a table under table_dir.
+    Words the model has no vector for are left out. Returns the number of rows written.
+    """
+    import spacy
+    from src.nlp.vectorizer import UNUSED_PIPES
+
+    nlp = spacy.load(model_name)
+    # Models without static vectors (e.g. en_core_web_sm) return the tok2vec tensor mean,
+    # so size the table from doc.vector as the Vectorizer does, not from vocab.vectors_length
+    dim = int(nlp("x").vector.shape[0])
+    if dim == 0:
+        raise ValueError(f"Model '{model_name}' produces no document vectors; nothing to export.")
+    disabled = [name for name in UNUSED_PIPES if name in nlp.pipe_names]
+    tokens = []
+    vectors = []
+    for word, doc in zip(words, nlp.pipe(words, batch_size=batch_size, disable=disabled)):
+        if doc.has_vector and doc.vector_norm > 0:
+            tokens.append(word)
+            vectors.append(doc.vector)
+
+    os.makedirs(table_dir, exist_ok=True)
+    vectors_path, tokens_path = table_paths(table_dir, model_name)
+    matrix = np.array(vectors, dtype=np.float32).reshape(len(vectors), dim)
+    np.save(vectors_path, matrix)
+    with open(tokens_path, 'w', encoding='utf-8') as f:
+        json.dump(tokens, f, ensure_ascii=False)
+    return len(tokens)
+
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from src.deap.mutation import CONNECTORS
+    from src.nlp.vectorizer import DEFAULT_MODEL
+
+    parser = argparse.ArgumentParser(description="Export a pruned, vectors-only model table")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="spaCy model to export")
+    parser.add_argument("--data-dir", default="data", help="Data directory (vocabulary source and output)")
+    args = parser.parse_args()
+
+    words = collect_vocabulary(args.data_dir, CONNECTORS)
+    table_dir = os.path.join(args.data_dir, "vectors")
+    count = export_vector_table(args.model, words, table_dir)
+    print(f"Exported {count}/{len(words)} vocabulary vectors to {table_paths(table_dir, args.model)[0]}")
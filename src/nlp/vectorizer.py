@@ -1,25 +1,76 @@
-import math
-import hashlib
-import random
 import numpy as np
 import os
+from typing import List, Optional, Dict, Iterable
 
-# Try to import spacy
-try:
-    import spacy
-    SPACY_AVAILABLE = True
-except Exception as e:
-    # Catching generic Exception because ImportError might not catch DLL load failures or version conflicts
-    print(f"Warning: Failed to import spacy ({e}). Using fallback vectorizer.")
-    SPACY_AVAILABLE = False
+from src.nlp.hashing import HashingEmbedder
+from src.nlp.vector_cache import VectorCache
+from src.nlp.vector_table import VectorTable
+
+# spaCy is imported on first use (see _import_spacy), not at module load.
+# Importing it takes seconds and most entry points never need it.
+_spacy = None
+_spacy_checked = False
+
+def _import_spacy():
+    """Returns the spacy module, or None if it cannot be imported."""
+    global _spacy, _spacy_checked
+    if not _spacy_checked:
+        _spacy_checked = True
+        try:
+            import spacy
+            _spacy = spacy
+        except Exception as e:
+            # Catching generic Exception because ImportError might not catch DLL load failures or version conflicts
+            print(f"Warning: Failed to import spacy ({e}). Using fallback vectorizer.")
+    return _spacy
+
+# Pipeline components that do not contribute to doc.vector.
+# They are disabled while batching through nlp.pipe.
+UNUSED_PIPES = ["parser", "ner", "tagger", "morphologizer", "lemmatizer", "attribute_ruler", "senter"]
+
+# Vectorizer backends:
+#   "spacy":   spaCy model vectors, n-gram hashing for anything the model cannot vectorize
+#   "table":   exported vectors-only table (see vector_table.py), no spaCy import
+#   "hashing": n-gram hashing only (fast, no model download; default on Vercel and in tests)
+BACKENDS = ("spacy", "table", "hashing")
+DEFAULT_BACKEND = os.environ.get("MINDMUTANT_VECTORIZER", "spacy")
+DEFAULT_MODEL = os.environ.get("MINDMUTANT_MODEL", "en_core_web_sm")
 
 class Vectorizer:
-    def __init__(self, model_name="en_core_web_sm"):
+    def __init__(self, model_name=DEFAULT_MODEL, batch_size: int = 256, cache_dir: Optional[str] = None,
+                 compositional: bool = False, connector_words: Iterable[str] = (), connector_weight: float = 0.3,
+                 backend: Optional[str] = None, hashing_dim: int = 256, table_dir: Optional[str] = None):
+        self.model_name = model_name
+        self.backend = backend or DEFAULT_BACKEND
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unknown vectorizer backend '{self.backend}'. Choose from {BACKENDS}.")
         self.nlp = None
         self.use_spacy = False
-        self.dim = 96 # Dimension for fallback vectors
+        self.dim = hashing_dim # Dimension for fallback vectors
+        self.batch_size = batch_size
+        self.cache = None
+        self.table = None
+
+        # Compositional mode: sentence vector = weighted sum of cached token vectors
+        self.compositional = compositional
+        self.connector_words = set(connector_words)
+        self.connector_weight = connector_weight
+        self.token_vectors: Dict[str, np.ndarray] = {}
         
-        if SPACY_AVAILABLE:
+        if self.backend == "spacy":
+            self._load_spacy_model(model_name)
+        elif self.backend == "table":
+            self._load_table(table_dir, model_name)
+
+        self.embedder = HashingEmbedder(self.dim)
+
+        # Only model vectors are worth caching; fallback vectors are cheaper to recompute than to read back.
+        if cache_dir and self.use_spacy:
+            self.cache = VectorCache(cache_dir, model_name, self.dim)
+
+    def _load_spacy_model(self, model_name: str):
+        spacy = _import_spacy()
+        if spacy is not None:
             try:
                 # Suppress loading messages if possible, or just load
                 # Try loading Japanese model first if context suggests, but default to en for now or small one
@@ -28,37 +79,130 @@ class Vectorizer:
                 if spacy.util.is_package(model_name):
                     self.nlp = spacy.load(model_name)
                     self.use_spacy = True
+                    # Keep fallback vectors the same width as model vectors. Models without static
+                    # vectors (e.g. en_core_web_sm) return the tok2vec tensor mean, so probe the width.
+                    self.dim = int(self.nlp("x").vector.shape[0]) or self.dim
                 else:
-                    print(f"Spacy model '{model_name}' not found. Using deterministic fallback vectors.")
+                    print(f"Spacy model '{model_name}' not found. Using n-gram hashing vectors.")
             except Exception as e:
-                print(f"Error loading Spacy model: {e}. Using deterministic fallback vectors.")
+                print(f"Error loading Spacy model: {e}. Using n-gram hashing vectors.")
+        else:
+            print("Spacy library not found. Using n-gram hashing vectors.")
+
+    def _load_table(self, table_dir: Optional[str], model_name: str):
+        if table_dir and VectorTable.exists(table_dir, model_name):
+            self.table = VectorTable(table_dir, model_name)
+            self.dim = self.table.dim
         else:
-            print("Spacy library not found. Using deterministic fallback vectors.")
+            print(f"Vector table for '{model_name}' not found in {table_dir}. Using n-gram hashing vectors.")
+
+    def flush(self):
+        """Writes cached vectors to disk (called on checkpoints)."""
+        if self.cache is not None:
+            self.cache.flush()
+
+    def close(self):
+        if self.cache is not None:
+            self.cache.close()
 
     def get_vector(self, text: str) -> list:
         """
         Returns a vector representation of the text.
         """
-        if self.use_spacy and self.nlp:
-            try:
-                doc = self.nlp(text)
-                if doc.has_vector and doc.vector_norm > 0:
-                    return doc.vector.tolist()
-            except Exception:
-                pass
-        
-        # Fallback: Deterministic random vector based on hash
+        # Same path (and width) as batch vectorization whenever a model is involved
+        if self.cache is not None or self.compositional or self.table is not None or self.use_spacy:
+            return self.get_vectors([text])[0].tolist()
+
+        # Fallback: Deterministic n-gram hashing vector
         return self._get_fallback_vector(text)
 
+    def get_vectors(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+        """
+        Returns a (len(texts), dim) float32 matrix of vector representations.
+        Texts are streamed through nlp.pipe in batches with the components
+        that vectors do not need switched off.
+        In compositional mode texts are built from cached token vectors instead.
+        """
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        if self.compositional:
+            return self.compose_many([text.split() for text in texts], batch_size=batch_size)
+        return self._embed(texts, batch_size)
+
+    def compose(self, tokens: List[str]) -> np.ndarray:
+        """Returns the compositional vector of a token list."""
+        return self.compose_many([tokens])[0]
+
+    def compose_many(self, token_lists: List[List[str]], batch_size: Optional[int] = None) -> np.ndarray:
+        """
+        Returns a (len(token_lists), dim) matrix of weighted token-vector sums.
+        Only tokens not seen before are embedded (in one batch); the rest come from the token cache.
+        """
+        self._ensure_tokens({t for tokens in token_lists for t in tokens}, batch_size)
+
+        matrix = np.zeros((len(token_lists), self.dim), dtype=np.float32)
+        flat = [t for tokens in token_lists for t in tokens]
+        if not flat:
+            return matrix
+        rows = np.repeat(np.arange(len(token_lists)), [len(tokens) for tokens in token_lists])
+        weights = np.array([self.token_weight(t) for t in flat], dtype=np.float32)
+        np.add.at(matrix, rows, weights[:, None] * np.stack([self.token_vectors[t] for t in flat]))
+        return matrix
+
+    def token_weight(self, token: str) -> float:
+        return self.connector_weight if token in self.connector_words else 1.0
+
+    def _ensure_tokens(self, tokens: Iterable[str], batch_size: Optional[int] = None):
+        new_tokens = [t for t in tokens if t not in self.token_vectors]
+        if new_tokens:
+            vectors = self._embed(new_tokens, batch_size)
+            self.token_vectors.update(zip(new_tokens, vectors))
+
+    def _embed(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+        """Runs texts through the cache, the model and the fallback, in that order."""
+
+        if self.cache is not None:
+            matrix, filled = self.cache.lookup(texts)
+        else:
+            matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+            filled = np.zeros(len(texts), dtype=bool)
+
+        missing = np.flatnonzero(~filled)
+        if self.table is not None and len(missing):
+            found_vectors, found = self.table.embed([texts[i] for i in missing])
+            matrix[missing[found]] = found_vectors[found]
+            filled[missing[found]] = True
+
+        if self.use_spacy and self.nlp and len(missing):
+            disabled = [name for name in UNUSED_PIPES if name in self.nlp.pipe_names]
+            computed = np.zeros(len(texts), dtype=bool)
+            try:
+                docs = self.nlp.pipe((texts[i] for i in missing), batch_size=batch_size or self.batch_size, disable=disabled)
+                for i, doc in zip(missing, docs):
+                    if doc.has_vector and doc.vector_norm > 0:
+                        if doc.vector.shape[0] != self.dim:
+                            raise ValueError(f"Model '{self.model_name}' returned {doc.vector.shape[0]}-d vectors, expected {self.dim}")
+                        matrix[i] = doc.vector
+                        computed[i] = True
+            except RuntimeError as e:
+                # Model failures fall back to hashing; width mismatches (ValueError) are bugs and propagate
+                print(f"Warning: spaCy vectorization failed ({e}). Using n-gram hashing vectors.")
+
+            if self.cache is not None and computed.any():
+                rows = np.flatnonzero(computed)
+                self.cache.store([texts[i] for i in rows], matrix[rows])
+            filled |= computed
+
+        # Fallback for anything the model could not vectorize, in one batch
+        missing = np.flatnonzero(~filled)
+        if len(missing):
+            matrix[missing] = self.embedder.embed([texts[i] for i in missing])
+
+        return np.ascontiguousarray(matrix)
+
     def _get_fallback_vector(self, text: str) -> list:
-        # Create a deterministic seed from the text
-        hash_obj = hashlib.md5(text.encode('utf-8'))
-        seed = int(hash_obj.hexdigest(), 16)
-        rng = random.Random(seed)
-        
-        # Generate random vector
-        vector = [rng.uniform(-1.0, 1.0) for _ in range(self.dim)]
-        return vector
+        return self.embedder.embed([text])[0].tolist()
 
     @staticmethod
     def calculate_similarity(vec1: list, vec2: list) -> float:
@@ -74,7 +218,20 @@ class Vectorizer:
         if norm1 == 0 or norm2 == 0:
             return 0.0
             
-        return float(np.dot(v1, v2) / (norm1 * norm2))
+        # Rounding can push the cosine of near-identical vectors past +-1
+        return float(np.clip(np.dot(v1, v2) / (norm1 * norm2), -1.0, 1.0))
+
+    @staticmethod
+    def normalize(matrix: np.ndarray) -> np.ndarray:
+        """
+        Returns a float32 copy of matrix with every row scaled to unit L2 norm.
+        Zero rows stay zero, so their cosine similarity to anything is 0.0.
+        """
+        matrix = np.array(matrix, dtype=np.float32, ndmin=2)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+        return matrix
 
     @staticmethod
     def calculate_distance(vec1: list, vec2: list) -> float:
@@ -1,7 +1,6 @@
 import streamlit as st
 import os
 import sys
-import glob
 import json
 import streamlit.components.v1 as components
 
@@ -9,6 +8,7 @@ import streamlit.components.v1 as components
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 
 from src.deap.evolution import Evolution
+from src.deap.manifest import get_latest_generation as get_manifest_latest
 
 st.set_page_config(layout="wide", page_title="MindMutant Dashboard")
 
@@ -23,22 +23,9 @@ st.sidebar.header("Evolution Controls")
 if 'evolution' not in st.session_state:
     st.session_state.evolution = Evolution()
 
-# Get current generation
+# Get current generation (cached manifest, re-read only when it changes)
 def get_latest_generation():
-    dirs = glob.glob("data/g*")
-    max_g = 0
-    if not dirs:
-        return 0
-    for d in dirs:
-        try:
-            name = os.path.basename(d)
-            if name.startswith('g') and name[1:].isdigit():
-                g = int(name[1:])
-                if g > max_g:
-                    max_g = g
-        except:
-            pass
-    return max_g
+    return max(0, get_manifest_latest("data"))
 
 current_g = get_latest_generation()
 st.sidebar.markdown(f"**Current Generation:** g{current_g}")
@@ -58,6 +45,18 @@ if st.sidebar.button("💀 Force Disaster (Next Gen)"):
         st.success("Disaster Executed!")
         st.rerun()
 
+run_generations = st.sidebar.number_input("Generations to run", min_value=1, max_value=1000, value=10)
+if st.sidebar.button("⏩ Run Generations"):
+    progress = st.sidebar.progress(0.0)
+    line = st.sidebar.empty()
+    for i, stats in enumerate(st.session_state.evolution.stream(current_g, int(run_generations))):
+        novelty = stats["novelty"]
+        progress.progress((i + 1) / run_generations)
+        line.text(f"g{stats['generation']}: novelty {novelty['min']:.3f}/{novelty['mean']:.3f}/{novelty['max']:.3f}"
+                  + (" 💀" if stats["disaster"] else ""))
+    st.success("Run Complete!")
+    st.rerun()
+
 # Visualization
 st.header(f"Generation g{current_g} Visualization")
 
@@ -70,15 +69,25 @@ if os.path.exists(html_path):
     st.caption(f"Loading visualization from: {url}")
     components.iframe(url, height=800, scrolling=True)
 else:
-    st.warning(f"No visualization found for Generation g{current_g}. Run evolution to generate.")
+    status = st.session_state.evolution.repo.load_artifact_status(current_g) or {}
+    if status.get("status") in ("pending", "running"):
+        st.info(f"Visualization for Generation g{current_g} is still rendering. Refresh in a moment.")
+    else:
+        st.warning(f"No visualization found for Generation g{current_g}. Run evolution to generate.")
 
 # Data Inspection
 st.header("Population Data")
 json_path = f"data/g{current_g}/situation.json"
+data = None
 if os.path.exists(json_path):
     with open(json_path, 'r', encoding='utf-8') as f:
         data = json.load(f)
-    
+else:
+    # Binary storage keeps no situation.json
+    records = st.session_state.evolution.repo.load_generation(current_g)
+    if records:
+        data = {"analysis": records}
+if data is not None:
     # Handle dict wrapper (new format) vs list (old format)
     if isinstance(data, dict) and "analysis" in data:
         population_list = data["analysis"]
@@ -102,3 +111,22 @@ if os.path.exists(json_path):
     st.caption(f"Total Population: {len(table_data)}")
 else:
     st.info("No population data found.")
+
+# History (SQLite store)
+if os.path.exists("data/mindmutant.db"):
+    from src.deap.sqlite_repository import SQLiteRepository
+
+    st.header("Novelty History")
+    history = SQLiteRepository(db_path="data/mindmutant.db")
+    trend = [row for row in history.novelty_trend() if row["mean"] is not None]
+    history.close()
+    if trend:
+        st.line_chart(
+            {
+                "generation": [row["generation"] for row in trend],
+                "mean": [row["mean"] for row in trend],
+                "max": [row["max"] for row in trend],
+            },
+            x="generation", y=["mean", "max"]
+        )
+        st.caption(f"Generations g{trend[0]['generation']} to g{trend[-1]['generation']}")
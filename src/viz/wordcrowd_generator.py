@@ -1,27 +1,42 @@
 import os
 import json
 import random
+from typing import Dict, Any, Optional
 
-def generate_wordcrowd(g_dir: str):
+def load_situation(g_dir: str) -> Optional[Dict[str, Any]]:
+    """situation.json of a generation directory, or one built from its generation.bin (binary storage)."""
+    situation_path = os.path.join(g_dir, "situation.json")
+    if os.path.exists(situation_path):
+        with open(situation_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    from src.deap.generation_file import GenerationFile, FILENAME
+    generation_path = os.path.join(g_dir, FILENAME)
+    if os.path.exists(generation_path):
+        reader = GenerationFile(generation_path)
+        return {
+            "generation": reader.generation,
+            "analysis": [{"id": r["id"], "content": r["content"], "fitness": r["fitness"]} for r in reader.records()]
+        }
+    return None
+
+def generate_wordcrowd(g_dir: str, situation: Optional[Dict[str, Any]] = None, verbose: bool = True):
     """
-    Generates a Word Crowd HTML file from situation.json in the given generation directory.
+    Generates a Word Crowd HTML file in the given generation directory from situation
+    (read from its situation.json or generation.bin when not given).
     Uses vector analysis for visualization features (clustering, size, color).
+    verbose=False leaves reporting the path to the caller (g_dir may be a staging directory).
     """
-    situation_path = os.path.join(g_dir, "situation.json")
-    if not os.path.exists(situation_path):
-        print(f"Situation file not found: {situation_path}")
-        return
-
-    try:
-        with open(situation_path, 'r', encoding='utf-8') as f:
-            situation = json.load(f)
-            analysis_data = situation.get("analysis", [])
-            # Also get keywords for fallback or full list if analysis is partial
-            # But analysis should cover all population.
-            # Let's use analysis data primarily.
-    except Exception as e:
-        print(f"Error loading situation.json: {e}")
-        return
+    if situation is None:
+        try:
+            situation = load_situation(g_dir)
+        except Exception as e:
+            print(f"Error loading situation: {e}")
+            return
+        if situation is None:
+            print(f"Situation file not found in {g_dir}")
+            return
+    analysis_data = situation.get("analysis", [])
 
     # HTML Template
     html_content = f"""<!DOCTYPE html>
@@ -179,6 +194,7 @@ def generate_wordcrowd(g_dir: str):
     try:
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(html_content)
-        print(f"Word crowd generated: {output_path}")
+        if verbose:
+            print(f"Word crowd generated: {output_path}")
     except Exception as e:
         print(f"Error writing wordcrowd.html: {e}")